@@ -0,0 +1,140 @@
+from typing import Dict, Iterable, List, Union
+
+from inventory import classify_hostname
+
+# pyarrow is optional, only needed for --formats parquet
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+if pa is not None:
+    _category = pa.dictionary(pa.int32(), pa.string())
+    _vlan_list = pa.list_(pa.int16())
+
+    # One row per comparison record, the same rows as all_zones_vlan_comparison.csv
+    COMPARISON_SCHEMA = pa.schema([
+        ("Zone", _category),
+        ("DC", _category),
+        ("Switch_Type", _category),
+        ("Switch", pa.string()),
+        ("Has_VLANs", _vlan_list),
+        ("Missing_VLANs", _vlan_list),
+    ])
+
+    # One row per switch with the VLANs from its show_vlan
+    DEVICE_SCHEMA = pa.schema([
+        ("Hostname", pa.string()),
+        ("Site", _category),
+        ("Role", _category),
+        ("Env", _category),
+        ("Index", pa.int16()),
+        ("VLANs", _vlan_list),
+    ])
+
+    # One row per (VLAN, device) in the svi_fw results, with the SVI / firewall details when present
+    VLAN_FACT_SCHEMA = pa.schema([
+        ("VLAN_ID", pa.int16()),
+        ("Zone", _category),
+        ("Hostname", pa.string()),
+        ("Site", _category),
+        ("Role", _category),
+        ("Has_VLAN", pa.bool_()),
+        ("Interface", pa.string()),
+        ("VRF", _category),
+        ("IP", pa.string()),
+        ("FW_Zone", _category),
+        ("FW_Fwd", _category),
+    ])
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Parquet output needs pyarrow, install it with: pip install pyarrow")
+
+
+def _table(columns: Dict[str, list], schema) -> "pa.Table":
+    return pa.Table.from_arrays([pa.array(columns[field.name], type=field.type) for field in schema],
+                                schema=schema)
+
+
+def _vlan_ids(vlans: Iterable[Union[int, str]]) -> List[int]:
+    return [int(vlan_id) for vlan_id in vlans]
+
+
+def comparison_table(comparison_results: List[Dict[str, object]]) -> "pa.Table":
+    """
+    Comparison records (cor_tor results) as a table, VLAN lists as list<int16>
+    """
+    _require_pyarrow()
+    columns = {field: [] for field in COMPARISON_SCHEMA.names}
+    for result in comparison_results:
+        for field in ("Zone", "DC", "Switch_Type", "Switch"):
+            columns[field].append(result[field])
+        columns["Has_VLANs"].append(_vlan_ids(result["Has_VLANs"]))
+        columns["Missing_VLANs"].append(_vlan_ids(result["Missing_VLANs"]))
+    return _table(columns, COMPARISON_SCHEMA)
+
+
+def device_table(host_vlans: Dict[str, Iterable[Union[int, str]]]) -> "pa.Table":
+    """
+    hostname -> VLAN IDs as a table, with the site / role / env / number from the hostname
+    """
+    _require_pyarrow()
+    columns = {field: [] for field in DEVICE_SCHEMA.names}
+    for hostname, vlans in host_vlans.items():
+        info = classify_hostname(hostname)
+        columns["Hostname"].append(hostname)
+        columns["Site"].append(info.site)
+        columns["Role"].append(info.role)
+        columns["Env"].append(info.env)
+        columns["Index"].append(info.index)
+        columns["VLANs"].append(sorted(_vlan_ids(vlans)))
+    return _table(columns, DEVICE_SCHEMA)
+
+
+def vlan_facts_table(results: Dict[str, Dict[str, Dict[str, object]]],
+                     vlan_zones: Dict[str, str]) -> "pa.Table":
+    """
+    The svi_fw results (VLAN -> hostname -> has_vlan / sw_* / fw_* fields) flattened to one row per
+    (VLAN, device), sorted by VLAN then hostname
+    """
+    _require_pyarrow()
+    columns = {field: [] for field in VLAN_FACT_SCHEMA.names}
+    for vlan in sorted(results, key=int):
+        for hostname in sorted(results[vlan]):
+            device_data = results[vlan][hostname]
+            info = classify_hostname(hostname)
+            columns["VLAN_ID"].append(int(vlan))
+            columns["Zone"].append(vlan_zones.get(vlan, ""))
+            columns["Hostname"].append(hostname)
+            columns["Site"].append(info.site)
+            columns["Role"].append(info.role)
+            columns["Has_VLAN"].append(device_data.get("has_vlan", False))
+            columns["Interface"].append(device_data.get("sw_interface", device_data.get("fw_interface")))
+            columns["VRF"].append(device_data.get("sw_vrf"))
+            columns["IP"].append(device_data.get("sw_ip", device_data.get("fw_ip")))
+            columns["FW_Zone"].append(device_data.get("fw_zone"))
+            columns["FW_Fwd"].append(device_data.get("fw_fwd"))
+    return _table(columns, VLAN_FACT_SCHEMA)
+
+
+def write_parquet(table: "pa.Table", filename):
+    _require_pyarrow()
+    pq.write_table(table, str(filename))
+
+
+def read_parquet(filename, columns: List[str] = None, filters=None) -> "pa.Table":
+    """
+    Memory-maps a parquet output, optionally reading only some columns and filtering rows,
+    e.g. filters=[("Zone", "=", "MSS"), ("DC", "=", "DC1")]
+    """
+    _require_pyarrow()
+    return pq.read_table(str(filename), columns=columns, filters=filters, memory_map=True)
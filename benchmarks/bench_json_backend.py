@@ -0,0 +1,54 @@
+"""
+Times every available JSON backend on real collector output.
+
+    python benchmarks/bench_json_backend.py                      # all show_interface_all.json under CONFIGS_DIR
+    python benchmarks/bench_json_backend.py path/to/file.json --repeat 20
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config_scanner import get_command_files
+from json_backend import available_backends, loads
+from svi_fw_vlan_comparison import CONFIGS_DIR
+
+
+def time_backend(payloads, backend, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for data in payloads:
+            loads(data, backend)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON decoder backends on device files")
+    parser.add_argument("files", nargs="*", help="JSON files to decode (default: every show_interface_all.json)")
+    parser.add_argument("--configs-dir", default=CONFIGS_DIR, type=Path)
+    parser.add_argument("--command", default="show_interface_all")
+    parser.add_argument("--repeat", default=5, type=int)
+    args = parser.parse_args()
+
+    files = args.files or [filename for _, filename in get_command_files(args.configs_dir, args.command)]
+    if not files:
+        print("No files to benchmark")
+        return
+
+    # Read once up front so only decoding is timed
+    payloads = [Path(filename).read_bytes() for filename in files]
+    total_mb = sum(len(data) for data in payloads) / 1e6
+    print(f"{len(payloads)} files, {total_mb:.1f} MB, best of {args.repeat}")
+
+    baseline = time_backend(payloads, "json", args.repeat)
+    for backend in available_backends():
+        seconds = baseline if backend == "json" else time_backend(payloads, backend, args.repeat)
+        print(f"{backend:10} {seconds * 1000:10.1f} ms {total_mb / seconds:8.1f} MB/s {baseline / seconds:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Times the main steps of both comparison scripts on synthetic estates of 100, 1,000 and 10,000 devices
+(written once by generate_configs.py and reused), and compares them with a stored baseline.
+
+    python benchmarks/bench_pipeline.py --save main                  # time and store as baselines/main.json
+    python benchmarks/bench_pipeline.py --compare main               # time and compare, exit 1 on a regression
+    python benchmarks/bench_pipeline.py --sizes 100,1000 --repeat 5
+
+Each step is timed on its own with its inputs prepared beforehand. A timing loops the step for at least
+0.2s (timeit's autorange) and the best per-call time of --repeat timings is kept.
+"""
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cor_tor_zone_comparison as cor_tor
+import svi_fw_vlan_comparison as svi_fw
+from config_scanner import get_manifest
+from excel_writer import write_excel
+from generate_configs import generate_config_tree, switches_per_site_for
+from inventory import build_switch_groups
+from vlan_matrix import VlanMatrix
+
+BASELINES_DIR = Path(__file__).resolve().parent / "baselines"
+ESTATES_DIR = Path(tempfile.gettempdir()) / "vlan_bench_estates"
+DEFAULT_SIZES = [100, 1000, 10000]
+
+# Steps this fast are listed but never flagged, their ratios are mostly timer and scheduler noise
+DEFAULT_FLOOR_MS = 5.0
+
+# Synthetic estate shape; the TOR_PRD count per site is sized to reach the device total
+ESTATE = {"cor": 2, "tor_mgt": 5, "acc": 1, "oob": 1, "vlans": 200, "drift": 0.05, "seed": 1}
+
+
+def estate_sites(devices: int) -> int:
+    return min(8, max(2, devices // 1000))
+
+
+def ensure_estate(devices: int, estates_dir: Path = ESTATES_DIR) -> Path:
+    """The synthetic configs tree for this size, generated the first time it is needed"""
+    root = estates_dir / f"estate_{devices}"
+    marker = root / "estate.json"
+    params = dict(ESTATE, devices=devices, sites=estate_sites(devices))
+    if marker.exists() and json.loads(marker.read_text()) == params:
+        return root
+
+    print(f"Generating {devices} device estate in {root}")
+    sites = params["sites"]
+    tor_prd = switches_per_site_for(devices, sites, ESTATE["cor"], ESTATE["tor_mgt"], ESTATE["acc"], ESTATE["oob"])
+    generate_config_tree(root, sites=sites, cor=ESTATE["cor"], tor_prd=tor_prd, tor_mgt=ESTATE["tor_mgt"],
+                         acc=ESTATE["acc"], oob=ESTATE["oob"], vlans=ESTATE["vlans"], drift=ESTATE["drift"],
+                         seed=ESTATE["seed"])
+    marker.write_text(json.dumps(params))
+    return root
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    """Best seconds per call over repeat timings, each running func enough times to take at least 0.2s"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def bench_estate(configs_dir: Path, out_dir: Path, repeat: int, workers: int) -> Dict[str, float]:
+    """step -> best seconds for one estate"""
+    get_manifest(configs_dir, refresh=True)
+
+    # Inputs for each step, built once outside the timings
+    vlan_data = cor_tor.read_vlan_data(configs_dir, workers)
+    matrix = VlanMatrix.from_vlan_data(vlan_data)
+    switch_groups = build_switch_groups(vlan_data)
+    vrf_records = cor_tor.read_vrf_records(configs_dir, workers)
+    vrf_index = cor_tor.build_vrf_index(cor_tor.ZONES, vrf_records)
+    comparison_results, _ = cor_tor.compare_zones_incremental(matrix, vrf_index, cor_tor.ZONES, switch_groups)
+    comparison_df = cor_tor.results_to_dataframe(comparison_results)
+
+    # One site's batched comparison, as compare_zones_incremental runs it for each site
+    site = cor_tor.get_sites(switch_groups)[0]
+    site_groups = cor_tor.get_switch_groups_for_dc(site, switch_groups)
+    site_matrix = matrix.subset([sw for group in site_groups for sw in group])
+    zone_cor_vlans = cor_tor.build_zone_cor_vlans(vrf_index, cor_tor.ZONES, site_groups[0])
+
+    results = svi_fw.read_vlan_files(configs_dir, workers)
+    results, vlan_zones = svi_fw.read_core_switch_files(results, configs_dir, workers)
+    results = svi_fw.read_files_firewalls(results, configs_dir, workers)
+    report_df = svi_fw.parse_results(results, vlan_zones)
+
+    steps = {
+        "read_vlan_data": lambda: cor_tor.read_vlan_data(configs_dir, workers),
+        "read_vrf_records": lambda: cor_tor.read_vrf_records(configs_dir, workers),
+        "build_vrf_index": lambda: cor_tor.build_vrf_index(cor_tor.ZONES, vrf_records),
+        "compare_dc_zones": lambda: cor_tor.compare_dc_zones(site, cor_tor.ZONES, site_matrix, zone_cor_vlans,
+                                                             site_groups),
+        "compare_zones_incremental": lambda: cor_tor.compare_zones_incremental(
+            matrix, vrf_index, cor_tor.ZONES, switch_groups, previous=None),
+        "results_to_dataframe": lambda: cor_tor.results_to_dataframe(comparison_results),
+        "parse_results": lambda: svi_fw.parse_results(results, vlan_zones),
+        "comparison csv": lambda: comparison_df.to_csv(out_dir / "comparison.csv", index=False),
+        "comparison xlsx": lambda: write_excel(comparison_df, out_dir / "comparison.xlsx", index=False),
+        "svi_fw csv": lambda: report_df.to_csv(out_dir / "results.csv"),
+        "svi_fw xlsx": lambda: write_excel(report_df, out_dir / "results.xlsx"),
+    }
+    timings = {}
+    for name, func in steps.items():
+        timings[name] = best_of(func, repeat)
+        print(f"  {name:34} {timings[name] * 1000:10.1f} ms")
+    return timings
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, object], threshold: float,
+            floor_s: float = DEFAULT_FLOOR_MS / 1000) -> List[str]:
+    """
+    Prints current / baseline per step and returns the steps slower than threshold x baseline,
+    leaving out steps that now take less than floor_s
+    """
+    print(f"\nAgainst baseline {baseline.get('commit') or '?'} from {baseline.get('date', '?')}:")
+    regressions = []
+    for size, timings in results.items():
+        baseline_timings = baseline["results"].get(size, {})
+        for name, seconds in timings.items():
+            if name not in baseline_timings:
+                continue
+            ratio = seconds / baseline_timings[name] if baseline_timings[name] else 1.0
+            flag = ""
+            if ratio > threshold and seconds >= floor_s:
+                flag = "  REGRESSION"
+                regressions.append(f"{size} {name}")
+            print(f"  {size:>6} {name:34} {seconds * 1000:10.1f} ms {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the comparison pipeline on synthetic estates")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated device counts (default 100,1000,10000)")
+    parser.add_argument("--repeat", default=3, type=int)
+    parser.add_argument("--workers", default=1, type=int, help="parse processes (1 keeps timings comparable)")
+    parser.add_argument("--estates-dir", default=ESTATES_DIR, type=Path,
+                        help="where the synthetic estates are generated and kept between runs")
+    parser.add_argument("--save", metavar="NAME", help="store the timings as baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="compare with baselines/NAME.json")
+    parser.add_argument("--threshold", default=1.2, type=float,
+                        help="slowdown ratio reported as a regression (default 1.2)")
+    parser.add_argument("--floor-ms", default=DEFAULT_FLOOR_MS, type=float,
+                        help="steps faster than this are not checked against the threshold (default 5)")
+    args = parser.parse_args()
+
+    # The scripts log every host at INFO
+    logging.basicConfig(level=logging.WARNING)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as out_dir:
+        for devices in (int(size) for size in args.sizes.split(",")):
+            configs_dir = ensure_estate(devices, args.estates_dir)
+            print(f"{devices} devices, best of {args.repeat}")
+            results[str(devices)] = bench_estate(configs_dir, Path(out_dir), args.repeat, args.workers)
+
+    run = {
+        "commit": git_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "repeat": args.repeat,
+        "workers": args.workers,
+        "results": results,
+    }
+    if args.save:
+        BASELINES_DIR.mkdir(exist_ok=True)
+        filename = BASELINES_DIR / f"{args.save}.json"
+        filename.write_text(json.dumps(run, indent=2))
+        print(f"Saved baseline to {filename}")
+
+    if args.compare:
+        baseline = json.loads((BASELINES_DIR / f"{args.compare}.json").read_text())
+        regressions = compare(results, baseline, args.threshold, args.floor_ms / 1000)
+        if regressions:
+            print(f"{len(regressions)} step(s) slower than {args.threshold}x baseline")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
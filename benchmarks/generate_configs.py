@@ -0,0 +1,183 @@
+"""
+Writes a synthetic configs tree in the collector layout (one folder per hostname holding show_vlan.json,
+show_ip_interface_brief_vrf_all.json and, for firewalls, the PAN-OS show_interface_all.json) for scale testing.
+
+    python benchmarks/generate_configs.py C:\\temp\\synthetic_configs                      # 2 sites, ~40 devices
+    python benchmarks/generate_configs.py C:\\temp\\synthetic_10k --devices 10000 --sites 8 --drift 0.02
+
+Then point the scripts at it with --configs-dir. The same seed always gives the same tree.
+"""
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from inventory import FIREWALL_SITES
+
+# Hostname state field per site, DC1 -> VIC, DC2 -> NSW, ...
+STATES = ["VIC", "NSW", "QLD", "WA", "SA", "TAS", "ACT", "NT"]
+
+# VRF name stems per zone, matching the zone patterns of both comparison scripts
+DEFAULT_ZONE_VRFS = ["EA-BMS", "MSS", "ITS", "corporate"]
+
+# Share of a site's VLANs that are not in any zone (default / transit VRFs)
+UNZONED_SHARE = 0.15
+
+
+def switch_hostname(site_number: int, role: str, env: str, index: int) -> str:
+    state = STATES[(site_number - 1) % len(STATES)]
+    return f"TU-{state}-DC{site_number}-L0-SW-{role}-{env}-{index:02d}"
+
+
+def firewall_hostname(site_number: int, index: int) -> str:
+    """Only sites with a building in inventory.FIREWALL_SITES get firewalls, otherwise they are not read"""
+    buildings = {site: building for building, site in FIREWALL_SITES.items()}
+    building = buildings.get(f"DC{site_number}")
+    if building is None:
+        return ""
+    state = STATES[(site_number - 1) % len(STATES)]
+    return f"TU{state}-{building}-PA-DCFW{index}"
+
+
+def vrf_names(zone_vrfs: List[str], vrfs_per_zone: int) -> Dict[str, List[str]]:
+    """zone stem -> its VRF names, e.g. ITS -> ITS, ITS-2, ITS-3"""
+    return {stem: [stem] + [f"{stem}-{k}" for k in range(2, vrfs_per_zone + 1)] for stem in zone_vrfs}
+
+
+def _write_json(folder: Path, command: str, data):
+    folder.mkdir(parents=True, exist_ok=True)
+    with open(folder / f"{command}.json", "w") as f:
+        json.dump(data, f)
+
+
+def _switch_files(folder: Path, vlans: Dict[int, str], svis: List[Dict[str, str]], mgmt_ip: str):
+    _write_json(folder, "show_vlan", [{"VLAN_ID": str(vlan_id), "VLAN_NAME": name, "STATUS": "active"}
+                                      for vlan_id, name in sorted(vlans.items())])
+    rows = svis + [
+        {"INTERFACE": "mgmt0", "VRF": "management", "IP_ADDRESS": mgmt_ip, "STATUS": "protocol-up/link-up/admin-up"},
+        {"INTERFACE": "Loopback0", "VRF": "default", "IP_ADDRESS": mgmt_ip.replace("10.", "172.", 1),
+         "STATUS": "protocol-up/link-up/admin-up"},
+    ]
+    _write_json(folder, "show_ip_interface_brief_vrf_all", rows)
+
+
+def _firewall_file(folder: Path, site_vlans: Dict[int, str], vlan_vrfs: Dict[int, str], site_number: int,
+                   fw_rate: float, rng: random.Random):
+    entries = [{"name": f"ethernet1/{port}", "zone": "", "fwd": "N/A", "vsys": 1, "dyn-addr": None,
+                "addr6": None, "tag": "0", "ip": "N/A", "id": str(15 + port), "addr": None}
+               for port in range(1, 9)]
+    for vlan_id in sorted(site_vlans):
+        if rng.random() < fw_rate:
+            entries.append({"name": f"ae1.{vlan_id}", "zone": vlan_vrfs.get(vlan_id, "transit").upper(),
+                            "fwd": "vr:default", "vsys": 1, "dyn-addr": None, "addr6": None,
+                            "tag": str(vlan_id), "ip": f"10.{site_number}.{vlan_id // 256}.{vlan_id % 256}/24",
+                            "id": str(256 + vlan_id), "addr": None})
+    _write_json(folder, "show_interface_all", {
+        "response": {"@status": "success", "result": {"ifnet": {"entry": entries}, "hw": {"entry": []}}}
+    })
+
+
+def generate_config_tree(root,
+                         sites: int = 2,
+                         cor: int = 2,
+                         tor_prd: int = 8,
+                         tor_mgt: int = 5,
+                         acc: int = 1,
+                         oob: int = 1,
+                         firewalls: int = 1,
+                         vlans: int = 300,
+                         zone_vrfs: List[str] = DEFAULT_ZONE_VRFS,
+                         vrfs_per_zone: int = 2,
+                         drift: float = 0.05,
+                         svi_rate: float = 0.7,
+                         fw_rate: float = 0.5,
+                         seed: int = 1) -> Dict[str, int]:
+    """
+    Writes the tree and returns counts of what was written.
+    Every switch at a site carries the site's VLANs except for a random `drift` share it is missing;
+    core switches have an SVI in the VLAN's zone VRF for a `svi_rate` share of their zoned VLANs,
+    and firewalls a sub-interface for a `fw_rate` share of the site's VLANs.
+    """
+    root = Path(root)
+    rng = random.Random(seed)
+    zone_vrf_names = vrf_names(zone_vrfs, vrfs_per_zone)
+    all_vrfs = [vrf for names in zone_vrf_names.values() for vrf in names]
+    counts = {"switches": 0, "firewalls": 0, "vlans": 0, "svis": 0}
+
+    roles = [("COR", "PRD", cor), ("TOR", "PRD", tor_prd), ("TOR", "MGT", tor_mgt),
+             ("ACC", "PRD", acc), ("OOB", "PRD", oob)]
+
+    for site_number in range(1, sites + 1):
+        site_vlans = {vlan_id: f"VLAN{vlan_id:04d}_DC{site_number}" for vlan_id in range(2, vlans + 2)}
+        vlan_vrfs = {vlan_id: rng.choice(all_vrfs) for vlan_id in site_vlans if rng.random() >= UNZONED_SHARE}
+
+        for role, env, count in roles:
+            for index in range(1, count + 1):
+                hostname = switch_hostname(site_number, role, env, index)
+                switch_vlans = {vlan_id: name for vlan_id, name in site_vlans.items() if rng.random() >= drift}
+                svis = []
+                if role == "COR":
+                    svis = [{"INTERFACE": f"Vlan{vlan_id}", "VRF": vlan_vrfs[vlan_id],
+                             "IP_ADDRESS": f"10.{site_number}.{vlan_id // 256}.{vlan_id % 256}",
+                             "STATUS": "protocol-up/link-up/admin-up"}
+                            for vlan_id in switch_vlans if vlan_id in vlan_vrfs and rng.random() < svi_rate]
+                _switch_files(root / hostname, switch_vlans, svis,
+                              f"10.{200 + site_number % 50}.{counts['switches'] // 250 % 256}.{counts['switches'] % 250 + 1}")
+                counts["switches"] += 1
+                counts["vlans"] += len(switch_vlans)
+                counts["svis"] += len(svis)
+
+        for index in range(1, firewalls + 1):
+            hostname = firewall_hostname(site_number, index)
+            if hostname:
+                _firewall_file(root / hostname, site_vlans, vlan_vrfs, site_number, fw_rate, rng)
+                counts["firewalls"] += 1
+
+    return counts
+
+
+def switches_per_site_for(devices: int, sites: int, cor: int, tor_mgt: int, acc: int, oob: int) -> int:
+    """TOR_PRD switches per site needed for roughly `devices` switches in total"""
+    fixed = cor + tor_mgt + acc + oob
+    return max(0, devices // sites - fixed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic configs tree for scale testing")
+    parser.add_argument("root", type=Path, help="folder to write the device folders into")
+    parser.add_argument("--sites", type=int, default=2)
+    parser.add_argument("--devices", type=int,
+                        help="total switches to aim for; sets the TOR_PRD count per site (overrides --tor-prd)")
+    parser.add_argument("--cor", type=int, default=2, help="core switches per site")
+    parser.add_argument("--tor-prd", type=int, default=8, help="TOR_PRD switches per site")
+    parser.add_argument("--tor-mgt", type=int, default=5, help="TOR_MGT switches per site")
+    parser.add_argument("--acc", type=int, default=1, help="access switches per site")
+    parser.add_argument("--oob", type=int, default=1, help="out-of-band switches per site")
+    parser.add_argument("--firewalls", type=int, default=1, help="firewalls per site (DC1 and DC2 only)")
+    parser.add_argument("--vlans", type=int, default=300, help="VLANs per site")
+    parser.add_argument("--zones", default=",".join(DEFAULT_ZONE_VRFS),
+                        help="comma separated zone VRF name stems")
+    parser.add_argument("--vrfs-per-zone", type=int, default=2)
+    parser.add_argument("--drift", type=float, default=0.05, help="share of site VLANs each switch is missing")
+    parser.add_argument("--svi-rate", type=float, default=0.7, help="share of zoned VLANs with an SVI on a core")
+    parser.add_argument("--fw-rate", type=float, default=0.5, help="share of site VLANs on each firewall")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    tor_prd = args.tor_prd
+    if args.devices:
+        tor_prd = switches_per_site_for(args.devices, args.sites, args.cor, args.tor_mgt, args.acc, args.oob)
+
+    counts = generate_config_tree(args.root, args.sites, args.cor, tor_prd, args.tor_mgt, args.acc, args.oob,
+                                  args.firewalls, args.vlans, args.zones.split(","), args.vrfs_per_zone,
+                                  args.drift, args.svi_rate, args.fw_rate, args.seed)
+    print(f"Wrote {counts['switches']} switches and {counts['firewalls']} firewalls to {args.root} "
+          f"({counts['vlans']} switch VLANs, {counts['svis']} core SVIs)")
+
+
+if __name__ == "__main__":
+    main()
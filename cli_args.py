@@ -0,0 +1,21 @@
+import argparse
+from pathlib import Path
+
+from ingest import DEFAULT_WORKERS
+
+
+def add_input_arguments(parser: argparse.ArgumentParser, configs_dir: Path):
+    """Where the device files are and how they are parsed, the same for every script that reads them"""
+    parser.add_argument("--configs-dir", type=Path, default=configs_dir)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="processes used to parse device files (1 = no pool)")
+    parser.add_argument("--no-cache", action="store_true", help="re-parse every file and skip the parsed-file cache")
+    parser.add_argument("--verify-hash", action="store_true",
+                        help="check file content hashes as well as size/mtime before reusing cached records")
+
+
+def add_site_workers_argument(parser: argparse.ArgumentParser):
+    # Separate from --workers: each site's comparison takes milliseconds, so a pool only pays off
+    # for very large estates, and spawning one costs over a second on Windows
+    parser.add_argument("--site-workers", type=int, default=1,
+                        help="processes used to compare sites in the cor-tor comparison (default 1 = no pool)")
@@ -0,0 +1,77 @@
+import os
+from typing import Dict, List, NamedTuple, Tuple
+
+
+class ManifestEntry(NamedTuple):
+    path: str
+    size: int
+    mtime: float
+
+
+# Command output files, the only files a device folder is scanned for
+COMMAND_FILE_EXTENSION = ".json"
+
+# hostname -> command name (file name without .json) -> entry
+Manifest = Dict[str, Dict[str, ManifestEntry]]
+
+# Manifests already built in this process, keyed by root path
+_manifests: Dict[str, Manifest] = {}
+
+
+def _scan_host_dir(host_dir: str, commands: Dict[str, ManifestEntry]):
+    """
+    Collects every .json file below a single device folder; anything else (show_vlan.bak, notes)
+    is ignored. Files in a folder are taken before its sub-folders, and the first file seen for a
+    command wins, so a stray copy in a nested folder does not shadow the top-level one.
+    """
+    sub_dirs = []
+    with os.scandir(host_dir) as it:
+        for entry in sorted(it, key=lambda e: e.name):
+            if entry.is_dir(follow_symlinks=False):
+                sub_dirs.append(entry.path)
+            elif entry.is_file():
+                command, extension = os.path.splitext(entry.name)
+                if extension == COMMAND_FILE_EXTENSION and command not in commands:
+                    stat = entry.stat()
+                    commands[command] = ManifestEntry(entry.path, stat.st_size, stat.st_mtime)
+
+    for sub_dir in sub_dirs:
+        _scan_host_dir(sub_dir, commands)
+
+
+def scan_config_tree(root) -> Manifest:
+    """
+    Walks the configs tree once and returns hostname -> {command name -> (path, size, mtime)}.
+    Each top-level folder under the root is a device, named after its hostname.
+    """
+    manifest: Manifest = {}
+    with os.scandir(root) as it:
+        host_dirs = sorted((e.name, e.path) for e in it if e.is_dir(follow_symlinks=False))
+
+    for hostname, host_dir in host_dirs:
+        commands: Dict[str, ManifestEntry] = {}
+        _scan_host_dir(host_dir, commands)
+        if commands:
+            manifest[hostname] = commands
+
+    return manifest
+
+
+def get_manifest(root, refresh: bool = False) -> Manifest:
+    """
+    Returns the manifest for a configs root, scanning it only the first time it is asked for
+    """
+    key = os.path.abspath(root)
+    if refresh or key not in _manifests:
+        _manifests[key] = scan_config_tree(key)
+    return _manifests[key]
+
+
+def get_command_files(root, command: str) -> List[Tuple[str, str]]:
+    """
+    Returns (hostname, path) for every device that has the given command file, e.g. "show_vlan"
+    """
+    manifest = get_manifest(root)
+    return [(hostname, commands[command].path)
+            for hostname, commands in manifest.items()
+            if command in commands]
@@ -1,11 +1,44 @@
-import glob
-import json
-from typing import Dict, List, Set, Tuple
+import argparse
+import hashlib
+import logging
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from arrow_output import comparison_table, device_table, write_parquet
+from cli_args import add_input_arguments, add_site_workers_argument
+from config_scanner import get_command_files, get_manifest
+from ingest import DEFAULT_WORKERS, ingest_files, parse_vlan_file, parse_vrf_file
+from inventory import UNKNOWN_SITE, build_switch_groups, discover_sites, switch_site
+from logging_setup import add_logging_arguments, configure_logging
+from profiling import add_profile_arguments, profiling
+from ndjson_io import COMPRESSIONS, ndjson_filename, write_ndjson
+from report_output import ReportTask, add_formats_argument, atomic_write, frame_tasks, write_reports
+from snapshot_cache import CACHE_FILENAME, SnapshotCache
+from stage_timer import RunReport
+from vlan_matrix import VLAN_SPACE, VlanMatrix, mask_to_strings
+from vrf_index import VrfIndex
+
 OUTPUT_DIR = Path(r"C:\vlan_script_functions\cor_tor_comparison_outputs")
+# Adjust if your input path changes
+CONFIGS_DIR = Path(r"C:\vlan_script_functions\configs")
+
+log = logging.getLogger(__name__)
+
+# Upper bound on the cells of one batched (zones x switches x VLAN) array
+MAX_BATCH_CELLS = 1 << 26
+
+# Previous run's comparison results, used to recompute only what changed
+STATE_FILENAME = "comparison_state.pkl"
+STATE_VERSION = 4
+
+# Reports written unless --formats says otherwise
+DEFAULT_FORMATS = ["csv", "xlsx", "json"]
 
 # Define zones to process - each will be processed separately
 ZONES = [
@@ -15,84 +48,58 @@ ZONES = [
     "CORPORATE"
 ]
 
-# Switch groups
-switch_types = {
-    "DC2_Core": ["TU-NSW-DC2-L0-SW-COR-PRD-01", "TU-NSW-DC2-L0-SW-COR-PRD-02"],
-    "DC2_TOR_MGT": [f"TU-NSW-DC2-L0-SW-TOR-MGT-0{i}" for i in range(1, 10)],
-    "DC2_TOR_PRD": [
-        "TU-NSW-DC2-L0-SW-TOR-PRD-01", "TU-NSW-DC2-L0-SW-TOR-PRD-02", "TU-NSW-DC2-L0-SW-TOR-PRD-03",
-        "TU-NSW-DC2-L0-SW-TOR-PRD-04", "TU-NSW-DC2-L0-SW-TOR-PRD-05", "TU-NSW-DC2-L0-SW-TOR-PRD-06",
-        "TU-NSW-DC2-L0-SW-TOR-PRD-07", "TU-NSW-DC2-L0-SW-TOR-PRD-09", "TU-NSW-DC2-L0-SW-TOR-PRD-10"
-    ],
-    "DC1_Core": ["TU-VIC-DC1-L0-SW-COR-PRD-01", "TU-VIC-DC1-L0-SW-COR-PRD-02"],
-    "DC1_TOR_MGT": [f"TU-VIC-DC1-L0-SW-TOR-MGT-0{i}" for i in range(1, 6)],
-    "DC1_TOR_PRD": [
-        "TU-VIC-DC1-L0-SW-TOR-PRD-01", "TU-VIC-DC1-L0-SW-TOR-PRD-02", "TU-VIC-DC1-L0-SW-TOR-PRD-03",
-        "TU-VIC-DC1-L0-SW-TOR-PRD-04", "TU-VIC-DC1-L0-SW-TOR-PRD-05", "TU-VIC-DC1-L0-SW-TOR-PRD-06",
-        "TU-VIC-DC1-L0-SW-TOR-PRD-07"
-    ]
-}
-
-
-def get_file_list_vlan():
-    # Adjust if your input path changes
-    search = r"C:\vlan_script_functions\configs\**\show_vlan.json"
-    return glob.glob(search, recursive=True)
-
-
-def get_file_list_vrf():
-    # Adjust if your input path changes
-    search = r"C:\vlan_script_functions\configs\**\show_ip_interface_brief_vrf_all.json"
-    return glob.glob(search, recursive=True)
-
-
-def read_vlan_data():
-    filenames = get_file_list_vlan()
+
+def get_file_list_vlan(configs_dir: Path = CONFIGS_DIR) -> List[Tuple[str, str]]:
+    return get_command_files(configs_dir, "show_vlan")
+
+
+def get_file_list_vrf(configs_dir: Path = CONFIGS_DIR) -> List[Tuple[str, str]]:
+    return get_command_files(configs_dir, "show_ip_interface_brief_vrf_all")
+
+
+def read_vlan_data(configs_dir: Path = CONFIGS_DIR,
+                   workers: int = DEFAULT_WORKERS,
+                   cache: Optional[SnapshotCache] = None):
+    files = [(hostname, filename) for hostname, filename in get_file_list_vlan(configs_dir)
+             if switch_site(hostname) != UNKNOWN_SITE]
+    return site_vlan_data(ingest_files(files, parse_vlan_file, workers, cache))
+
+
+def site_vlan_data(vlan_records: List[Tuple[str, list]]) -> Dict[str, list]:
+    """
+    hostname -> tuples of (VLAN_ID, VLAN_NAME), sorted by VLAN ID, for the switches at a known site
+    """
     vlan_data = {}
-    for filename in filenames:
-        hostname = filename.split("\\")[3]
-        if "DC" in hostname and ("VIC" in hostname or "NSW" in hostname):
-            with open(filename, "r") as f:
-                vlans = json.load(f)
-            # Collect tuples of (VLAN_ID, VLAN_NAME)
-            vlan_info = sorted({(str(v['VLAN_ID']), v.get('VLAN_NAME', '')) for v in vlans},
-                               key=lambda x: int(x[0]))
+    for hostname, vlan_info in vlan_records:
+        if switch_site(hostname) != UNKNOWN_SITE:
             vlan_data[hostname] = vlan_info
-        else:
-            continue
     return vlan_data
 
 
-def read_interface_vrf_data_for_zone(zone: str):
+def read_vrf_records(configs_dir: Path = CONFIGS_DIR,
+                     workers: int = DEFAULT_WORKERS,
+                     cache: Optional[SnapshotCache] = None) -> List[Tuple[str, list]]:
     """
-    Read VRF data for a specific zone
+    Read VRF data for every device, as (hostname, [(INTERFACE, VRF, IP_ADDRESS)])
     """
-    filenames = get_file_list_vrf()
-    interface_vrf_data: Dict[str, List[Dict[str, str]]] = {}
-
-    for filename in filenames:
-        with open(filename, "r") as f:
-            vrfs = json.load(f)
+    return ingest_files(get_file_list_vrf(configs_dir), parse_vrf_file, workers, cache)
 
-        hostname = filename.split("\\")[3]
-        zone_vrf_list = []
 
-        for vrf in vrfs:
-            vrf_name = vrf.get("VRF", "")
-            if zone.lower() in vrf_name.lower():
-                interface = vrf.get("INTERFACE", "")
-                vlan_id = interface.replace("Vlan", "") if interface.startswith("Vlan") else ""
-                if vlan_id:
-                    zone_vrf_list.append({
-                        "VRF_NAME": vrf_name,
-                        "INTERFACE": interface,
-                        "VLAN_ID": vlan_id
-                    })
+def build_vrf_index(zones: List[str], vrf_records: List[Tuple[str, list]]) -> VrfIndex:
+    """
+    Index the SVI rows by zone
+    """
+    vrf_index = VrfIndex(zones)
+    for hostname, svi_records in vrf_records:
+        vrf_index.add_host(hostname, svi_records)
+    return vrf_index
 
-        if zone_vrf_list:
-            interface_vrf_data[hostname] = zone_vrf_list
 
-    return interface_vrf_data
+def get_sites(switch_types_map: Dict[str, List[str]]) -> List[str]:
+    """
+    Sites (DC1, DC2, ...) that have switches in the switch groups
+    """
+    return discover_sites(sw for switches in switch_types_map.values() for sw in switches)
 
 
 def get_switch_groups_for_dc(dc: str, switch_types_map: Dict[str, List[str]]
@@ -111,221 +118,320 @@ def get_switch_groups_for_dc(dc: str, switch_types_map: Dict[str, List[str]]
 
 
 
-def collect_zone_vlans_in_cor(cor_switches: List[str],
-                              zone_vrf_data: Dict[str, List[Dict[str, str]]]
-                              ) -> Set[str]:
+def _result_rows(zone_name: str,
+                 dcs: List[str],
+                 switch_type_label: str,
+                 switches: List[str],
+                 has_vlans: np.ndarray,
+                 missing_vlans: np.ndarray
+                 ) -> List[Dict[str, object]]:
+    return [{
+        "Zone": zone_name,
+        "DC": dc,
+        "Switch_Type": switch_type_label,
+        "Switch": switch,
+        "Has_VLANs": mask_to_strings(has),
+        "Missing_VLANs": mask_to_strings(missing)
+    } for dc, switch, has, missing in zip(dcs, switches, has_vlans, missing_vlans)]
+
+
+def _log_switch_rows(results: List[Dict[str, object]], zone_name: str, has_suffix: str = "",
+                     missing_suffix: str = ""):
+    # Per-switch Has/Missing lines, only called when DEBUG is enabled
+    for row in results:
+        log.debug("\n%s:", row["Switch"])
+        log.debug(" Has %s VLANs%s: %s", zone_name, has_suffix, row["Has_VLANs"] or "None")
+        log.debug(" Missing %s VLANs%s: %s", zone_name, missing_suffix, row["Missing_VLANs"] or "None")
+
+
+def _log_dc_block(zone_name: str, dc: str, results: List[Dict[str, object]], all_cor_zone_vlans: np.ndarray):
+    # Per-switch Has/Missing lines of one (zone, DC) block, only called when DEBUG is enabled
+    log.debug("\n%s\n=== %s - Zone: %s ===\n%s", "=" * 60, dc, zone_name, "=" * 60)
+    log.debug("All %s VLANs across COR switches (baseline): %s", zone_name, mask_to_strings(all_cor_zone_vlans))
+    log.debug("Note: 'Has' means VLAN exists AND has a %s VRF interface", zone_name)
+    for switch_type, has_suffix in (("COR_within_DC", " (VLAN + VRF)"), ("TOR_PRD", ""), ("TOR_MGT", "")):
+        rows = [row for row in results if row["Switch_Type"] == switch_type]
+        if rows:
+            log.debug("\n--- %s Switches ---", switch_type)
+            _log_switch_rows(rows, zone_name, has_suffix)
+
+
+def tor_gaps(tor_vlans: np.ndarray, baselines: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Gets vlans data for the cor switches in the zones
+    The baseline VLANs each TOR switch has and is missing. Broadcasts, so baselines may carry a
+    leading zone axis against (1, TOR switches, VLAN) rows.
     """
-    zone_vlans_in_cor: Set[str] = set()
-    for cor_switch in cor_switches:
-        if cor_switch in zone_vrf_data:
-            for vrf_entry in zone_vrf_data[cor_switch]:
-                vlan_id = vrf_entry["VLAN_ID"]
-                if vlan_id:
-                    zone_vlans_in_cor.add(vlan_id)
-    return zone_vlans_in_cor
-
-
-def build_cor_zone_vlan_baseline(cor_switches: List[str],
-                                 vlan_data: Dict[str, List[Tuple[str, str]]],
-                                 zone_vlans_in_cor: Set[str]
-                                 ) -> Tuple[Dict[str, Set[str]], Set[str]]:
+    return tor_vlans & baselines, baselines & ~tor_vlans
+
+
+def compare_tor_group(dc: str,
+                      zone_name: str,
+                      tor_switches: List[str],
+                      matrix: VlanMatrix,
+                      all_cor_zone_vlans: np.ndarray,
+                      switch_type_label: str
+                      ) -> List[Dict[str, object]]:
     """
-    Gets cor_zone_vlans for a single zone, and uses cor_zone_vlan data
+    Compares tor switches with all cor switch vlans; used to patch single TOR rows of a reused block
     """
-    cor_switch_vlans: Dict[str, Set[str]] = {}
-    all_cor_zone_vlans: Set[str] = set()
+    tor_zone_vlans, missing_zone_vlans = tor_gaps(matrix.rows(tor_switches), all_cor_zone_vlans)
+    return _result_rows(zone_name, [dc] * len(tor_switches), switch_type_label,
+                        tor_switches, tor_zone_vlans, missing_zone_vlans)
 
-    for cor_switch in cor_switches:
-        cor_vlans = vlan_data.get(cor_switch, [])
-        cor_vlan_ids = {vlan_id for vlan_id, _ in cor_vlans}
-        cor_zone_vlans = cor_vlan_ids.intersection(zone_vlans_in_cor)
 
-        cor_switch_vlans[cor_switch] = cor_zone_vlans
-        all_cor_zone_vlans.update(cor_zone_vlans)
-
-    return cor_switch_vlans, all_cor_zone_vlans
+def infer_dc_from_switch_name(switch: str) -> str:
+    """Best-effort DC extraction from hostname (the site field, e.g. 'DC1' in TU-VIC-DC1-...)."""
+    return switch_site(switch)
 
 
-def compare_cor_switches(dc: str,
-                         zone_name: str,
-                         cor_switches: List[str],
-                         cor_switch_vlans: Dict[str, Set[str]],
-                         all_cor_zone_vlans: Set[str]
-                         ) -> List[Dict[str, object]]:
+def compare_cor_across_dcs(
+        zone_name: str,
+        xdc_cor_switch_vlans: Dict[str, np.ndarray],
+        xdc_all_cor_zone_vlans: np.ndarray,
+        switch_type_label: str = "DC1_vs_DC2"
+) -> List[Dict[str, object]]:
     """
-    Compares cor switch vlans within DC
+    Compare COR switches across DCs for a single zone:
+      - Baseline: union of COR zone VLANs across ALL DCs.
+      - For each COR switch across the DCs, a result row with its Has/Missing VLANs vs that global union.
     """
-    results: List[Dict[str, object]] = []
+    cor_switches = list(xdc_cor_switch_vlans)
+    has_vlans = np.stack(list(xdc_cor_switch_vlans.values()))
+    missing_vlans = xdc_all_cor_zone_vlans & ~has_vlans
+    # distinct label for cross-DC results
+    return _result_rows(zone_name, [infer_dc_from_switch_name(sw) for sw in cor_switches], switch_type_label,
+                        cor_switches, has_vlans, missing_vlans)
 
-    print(f"\n--- COR Switches Comparison (Within DC) ---")
-    print(f"All {zone_name} VLANs across COR switches (baseline): {sorted(all_cor_zone_vlans, key=int)}")
-    print(f"Note: 'Has' means VLAN exists AND has a {zone_name} VRF interface")
-
-    for cor_switch in cor_switches:
-        has_vlans = cor_switch_vlans.get(cor_switch, set())
-        missing_vlans = all_cor_zone_vlans - has_vlans
-
-        print(f"\n{cor_switch}:")
-        print(f" Has {zone_name} VLANs (VLAN + VRF): {sorted(has_vlans, key=int) if has_vlans else 'None'}")
-        print(f" Missing {zone_name} VLANs: {sorted(missing_vlans, key=int) if missing_vlans else 'None'}")
-        print(f"   DEBUG - baseline: {sorted(all_cor_zone_vlans, key=int)}")
-        print(f"   DEBUG - has: {sorted(has_vlans, key=int)}")
-        print(f"   DEBUG - missing: {sorted(missing_vlans, key=int)}")
-
-        results.append({
-            "Zone": zone_name,
-            "DC": dc,
-            "Switch_Type": "COR_within_DC",
-            "Switch": cor_switch,
-            "Has_VLANs": sorted(has_vlans, key=int),
-            "Missing_VLANs": sorted(missing_vlans, key=int)
-        })
 
-    return results
+def _digest(obj) -> str:
+    # repr rather than pickle: pickle output depends on object sharing, which differs between cached and fresh records
+    return hashlib.sha1(repr(obj).encode()).hexdigest()
 
 
-def compare_tor_group(dc: str,
-                      zone_name: str,
-                      tor_switches: List[str],
-                      vlan_data: Dict[str, List[Tuple[str, str]]],
-                      all_cor_zone_vlans: Set[str],
-                      switch_type_label: str
-                      ) -> List[Dict[str, object]]:
+def load_comparison_state(state_file: Path) -> Optional[Dict[str, object]]:
     """
-    Compares tor switches with all cor switch vlans
+    The last run's state, or None (a full run) when there is none or it cannot be used
     """
-    results: List[Dict[str, object]] = []
+    if not state_file.exists():
+        return None
+    try:
+        with open(state_file, "rb") as f:
+            state = pickle.load(f)
+    # A state pickled before a class moved or changed fails with AttributeError / ImportError
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError, TypeError,
+            ValueError) as e:
+        log.warning("Ignoring unreadable comparison state %s (%s), comparing everything", state_file, e)
+        return None
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        log.info("Comparison state %s is from another version, comparing everything", state_file)
+        return None
+    return state
+
+
+def save_comparison_state(state_file: Path, state: Dict[str, object]):
+    tmp_file = state_file.with_name(state_file.name + ".tmp")
+    with open(tmp_file, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, state_file)
+
+
+def build_zone_cor_vlans(vrf_index: VrfIndex, zones: List[str], cor_switches: List[str]) -> np.ndarray:
+    """
+    (zones x VLAN) mask of the VLANs that have a zone VRF interface on any of the COR switches,
+    built in one pass over the SVI rows.
+    """
+    zone_rows = {zone: i for i, zone in enumerate(zones)}
+    cor_set = set(cor_switches)
+    zone_idx: List[int] = []
+    vlan_idx: List[int] = []
 
-    for tor_switch in tor_switches:
-        tor_vlans = vlan_data.get(tor_switch, [])
-        tor_vlan_ids = {vlan_id for vlan_id, _ in tor_vlans}
-        tor_zone_vlans = tor_vlan_ids.intersection(all_cor_zone_vlans)
-        missing_zone_vlans = all_cor_zone_vlans - tor_vlan_ids
-
-        print(f"\n{tor_switch}:")
-        print(f" Has {zone_name} VLANs: {sorted(tor_zone_vlans, key=int) if tor_zone_vlans else 'None'}")
-        print(f" Missing {zone_name} VLANs: {sorted(missing_zone_vlans, key=int) if missing_zone_vlans else 'None'}")
-
-        results.append({
-            "Zone": zone_name,
-            "DC": dc,
-            "Switch_Type": switch_type_label,
-            "Switch": tor_switch,
-            "Has_VLANs": sorted(tor_zone_vlans, key=int),
-            "Missing_VLANs": sorted(missing_zone_vlans, key=int)
-        })
+    for hostname, vrf_name, _, vlan_id in vrf_index.rows:
+        if hostname not in cor_set:
+            continue
+        for zone in vrf_index.zones_for_vrf(vrf_name):
+            if zone in zone_rows:
+                zone_idx.append(zone_rows[zone])
+                vlan_idx.append(int(vlan_id))
+
+    mask = np.zeros((len(zones), VLAN_SPACE), dtype=bool)
+    mask[zone_idx, vlan_idx] = True
+    return mask
+
+
+def compare_dc_zones(dc: str,
+                     zones: List[str],
+                     matrix: VlanMatrix,
+                     zone_cor_vlans: np.ndarray,
+                     switch_groups: Tuple[List[str], List[str], List[str]]
+                     ) -> Dict[str, Tuple[List[Dict[str, object]], Dict[str, np.ndarray], np.ndarray]]:
+    """
+    Within-DC comparisons for one DC: COR vs COR, then TOR_PRD and TOR_MGT vs the COR baseline, for every
+    zone at once by broadcasting the (zones x VLAN) mask against the switch rows.
+    Returns zone -> (result rows, per-COR zone VLANs, COR baseline).
+    """
+    cor_switches, tor_prd_switches, tor_mgt_switches = switch_groups
 
-    return results
+    # (zones, COR switches, VLAN)
+    cor_zone_vlans = matrix.rows(cor_switches)[None, :, :] & zone_cor_vlans[:, None, :]
+    baselines = cor_zone_vlans.any(axis=1)
+    cor_missing = baselines[:, None, :] & ~cor_zone_vlans
 
+    dcs = [dc] * max(len(cor_switches), len(tor_prd_switches), len(tor_mgt_switches))
+    results = {zone: _result_rows(zone, dcs, "COR_within_DC", cor_switches, cor_zone_vlans[z], cor_missing[z])
+               for z, zone in enumerate(zones)}
 
-def infer_dc_from_switch_name(switch: str) -> str:
-    """Best-effort DC extraction from hostname (expects '-DC1-' or '-DC2-')."""
-    if "-DC1-" in switch:
-        return "DC1"
-    if "-DC2-" in switch:
-        return "DC2"
-    return "UNKNOWN"
+    for tor_switches, label in ((tor_prd_switches, "TOR_PRD"), (tor_mgt_switches, "TOR_MGT")):
+        tor_vlans = matrix.rows(tor_switches)
+        # Bound the (zones, TOR switches, VLAN) temporaries on large estates
+        step = max(1, MAX_BATCH_CELLS // max(1, len(tor_switches) * VLAN_SPACE))
+        for start in range(0, len(zones), step):
+            chunk = baselines[start:start + step, None, :]
+            has_vlans, missing_vlans = tor_gaps(tor_vlans[None, :, :], chunk)
+            for z, zone in enumerate(zones[start:start + step]):
+                results[zone].extend(_result_rows(zone, dcs, label, tor_switches, has_vlans[z], missing_vlans[z]))
 
+    return {zone: (results[zone],
+                   dict(zip(cor_switches, cor_zone_vlans[z])),
+                   baselines[z])
+            for z, zone in enumerate(zones)}
 
-def compare_cor_across_dcs(
-        zone_name: str,
-        xdc_cor_switch_vlans: Dict[str, Set[str]],
-        xdc_all_cor_zone_vlans: Set[str]
-) -> List[Dict[str, object]]:
+
+def cross_site_label(sites: List[str]) -> str:
+    """Switch_Type of the cross-DC rows, DC1_vs_DC2 for the two-DC estate"""
+    return "_vs_".join(sites)
+
+
+def _compare_site_zones(args):
+    # Process pool entry point, one call per site
+    return compare_dc_zones(*args)
+
+
+def compare_sites(site_jobs: List[Tuple[str, List[str], VlanMatrix, np.ndarray, Tuple[List[str], List[str], List[str]]]],
+                  workers: int = 1
+                  ) -> Dict[Tuple[str, str], Tuple[List[Dict[str, object]], Dict[str, np.ndarray], np.ndarray]]:
     """
-    Compare COR switches across DCs for a single zone:
-      - Baseline: union of COR zone VLANs across BOTH DCs.
-      - For each COR switch across both DCs, print Has/Missing vs that global union.
+    Runs compare_dc_zones for each site, on a process pool when there is more than one site and
+    workers > 1. Each job carries only its own site's switch rows. Returns (zone, site) -> block.
     """
-    results: List[Dict[str, object]] = []
-
-    print(f"\n--- COR Across DCs (Zone: {zone_name}) ---")
-    print(f"All {zone_name} VLANs across BOTH DCs (COR union): "
-          f"{sorted(xdc_all_cor_zone_vlans, key=int)}")
-
-    for cor_switch, has_vlans in xdc_cor_switch_vlans.items():
-        missing_vlans = xdc_all_cor_zone_vlans - has_vlans
-
-        print(f"\n{cor_switch}:")
-        print(f" Has {zone_name} VLANs: {sorted(has_vlans, key=int) if has_vlans else 'None'}")
-        print(f" Missing {zone_name} VLANs (vs ALL DCs): "
-              f"{sorted(missing_vlans, key=int) if missing_vlans else 'None'}")
-
-        results.append({
-            "Zone": zone_name,
-            "DC": infer_dc_from_switch_name(cor_switch),
-            "Switch_Type": "DC1_vs_DC2",  # distinct label for cross-DC results
-            "Switch": cor_switch,
-            "Has_VLANs": sorted(has_vlans, key=int),
-            "Missing_VLANs": sorted(missing_vlans, key=int),
-        })
+    if workers > 1 and len(site_jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(site_jobs))) as pool:
+            site_results = list(pool.map(_compare_site_zones, site_jobs))
+    else:
+        site_results = [_compare_site_zones(job) for job in site_jobs]
 
-    return results
+    return {(zone, job[0]): block
+            for job, zone_blocks in zip(site_jobs, site_results)
+            for zone, block in zone_blocks.items()}
 
 
-def compare_zone_vlans_tor_vs_cor(vlan_data, zone_vrf_data, zone_name):
+def compare_zones_incremental(matrix: VlanMatrix,
+                              vrf_index: VrfIndex,
+                              zones: List[str],
+                              switch_types_map: Dict[str, List[str]],
+                              previous: Optional[Dict[str, object]] = None,
+                              workers: int = 1
+                              ) -> Tuple[List[Dict[str, object]], Dict[str, object]]:
     """
-    Compare Zone VLANs between TOR and COR switches for a specific zone
-    - First compare COR switches against each other in the same DC
-    - Then check if TOR switches have the VLANs that exist in their DC's COR switches
-    - Finally: compare COR switches across BOTH DCs against the global COR union baseline
+    Compares zone VLANs between TOR and COR switches for every zone: COR switches against each other in
+    the same DC, TOR switches against their DC's COR baseline, then COR switches across all DCs against
+    the global COR union. Reuses the previous run's results where the inputs they depend on are unchanged:
+      - a (zone, DC) block is recomputed when any of its COR switches' VLANs or zone SVIs changed,
+        with all the recomputed zones of a DC done in one batched pass (compare_dc_zones)
+      - otherwise only the TOR rows whose switch VLANs changed are re-compared against the stored baseline
+      - the cross-DC COR comparison is redone only when one of the zone's DC blocks was recomputed
+    Sites are sharded across worker processes, and the cross-DC step merges their COR results.
+    Returns the results and the state to pass in next time.
     """
-    results = []
-
-    # Accumulators for cross-DC comparison
-    xdc_cor_switch_vlans: Dict[str, Set[str]] = {}  # across dc (xdc), switch -> zone VLAN set
-    xdc_all_cor_zone_vlans: Set[str] = set()  # global union across DC1 + DC2
-
-    for dc in ["DC1", "DC2"]:
-        print(f"\n{'=' * 60}")
-        print(f"=== Processing {dc} - Zone: {zone_name} ===")
-        print(f"{'=' * 60}")
-
-        # 1) Switch groups
-        cor_switches, tor_prd_switches, tor_mgt_switches = get_switch_groups_for_dc(dc, switch_types)
-        print(f"COR switches: {cor_switches}")
-        print(f"TOR_PRD switches: {tor_prd_switches}")
-        print(f"TOR_MGT switches: {tor_mgt_switches}")
-
-        # 2) Zone VLANs present in COR (from VRF data)
-        zone_vlans_in_cor = collect_zone_vlans_in_cor(cor_switches, zone_vrf_data)
-        print(f"\n{zone_name} VLANs found in {dc} COR switches (from VRF data): "
-              f"{sorted(zone_vlans_in_cor, key=int)}")
-
-        # 3) COR baseline & COR comparisons (within the DC)
-        cor_switch_vlans, all_cor_zone_vlans = build_cor_zone_vlan_baseline(
-            cor_switches, vlan_data, zone_vlans_in_cor
-        )
-        results.extend(
-            compare_cor_switches(dc, zone_name, cor_switches, cor_switch_vlans, all_cor_zone_vlans)
-        )
-
-        # Accumulate for cross-DC comparison
-        for sw, s in cor_switch_vlans.items():
-            xdc_cor_switch_vlans[sw] = s
-        xdc_all_cor_zone_vlans.update(all_cor_zone_vlans)
-
-        # 4) TOR_PRD comparisons
-        print(f"\n--- TOR_PRD Switches ---")
-        results.extend(
-            compare_tor_group(dc, zone_name, tor_prd_switches, vlan_data, all_cor_zone_vlans, "TOR_PRD")
-        )
-
-        # 5) TOR_MGT comparisons
-        print(f"\n--- TOR_MGT Switches ---")
-        results.extend(
-            compare_tor_group(dc, zone_name, tor_mgt_switches, vlan_data, all_cor_zone_vlans, "TOR_MGT")
-        )
-
-    # After both DCs processed, do cross-DC COR comparison once
-    if xdc_cor_switch_vlans and xdc_all_cor_zone_vlans:
-        results.extend(
-            compare_cor_across_dcs(zone_name, xdc_cor_switch_vlans, xdc_all_cor_zone_vlans)
-        )
-
-    return results
+    sites = get_sites(switch_types_map)
+    config_key = _digest((list(zones), sites, switch_types_map))
+    if previous is None or previous["config_key"] != config_key:
+        previous = {"blocks": {}, "xdc": {}, "tor_inputs": {}}
+
+    state = {"version": STATE_VERSION, "config_key": config_key, "blocks": {}, "xdc": {}, "tor_inputs": {}}
+    results: List[Dict[str, object]] = []
+    patched_tors = 0
+
+    def tor_changed(tor_switch: str) -> bool:
+        if tor_switch not in state["tor_inputs"]:
+            state["tor_inputs"][tor_switch] = _digest(np.packbits(matrix.rows([tor_switch])).tobytes())
+        return previous["tor_inputs"].get(tor_switch) != state["tor_inputs"][tor_switch]
+
+    # Zones without any VRF data are skipped, as in the per-zone run
+    active_zones = [zone for zone in zones if vrf_index.zone_view(zone)]
+
+    # 1) Find the (zone, DC) blocks whose COR inputs changed, and recompute them per DC in one batch
+    cor_inputs: Dict[Tuple[str, str], str] = {}
+    site_jobs = []
+    for dc in sites:
+        switch_groups = get_switch_groups_for_dc(dc, switch_types_map)
+        cor_switches, tor_prd_switches, tor_mgt_switches = switch_groups
+        for tor_switch in tor_prd_switches + tor_mgt_switches:
+            tor_changed(tor_switch)
+
+        cor_vlans = np.packbits(matrix.rows(cor_switches)).tobytes()
+        dirty_zones = []
+        for zone in active_zones:
+            zone_vrf_data = vrf_index.zone_view(zone)
+            cor_inputs[(zone, dc)] = _digest((cor_vlans, [zone_vrf_data.get(sw, []) for sw in cor_switches]))
+            block = previous["blocks"].get((zone, dc))
+            if block is None or block["cor_input"] != cor_inputs[(zone, dc)]:
+                dirty_zones.append(zone)
+
+        if dirty_zones:
+            zone_cor_vlans = build_zone_cor_vlans(vrf_index, dirty_zones, cor_switches)
+            site_matrix = matrix.subset(cor_switches + tor_prd_switches + tor_mgt_switches)
+            site_jobs.append((dc, dirty_zones, site_matrix, zone_cor_vlans, switch_groups))
+
+    recomputed = compare_sites(site_jobs, workers)
+
+    # 2) Assemble the rows in the per-zone order, patching TOR rows in the reused blocks
+    for zone in active_zones:
+        xdc_dirty = zone not in previous["xdc"]
+        xdc_cor_switch_vlans: Dict[str, np.ndarray] = {}
+        xdc_all_cor_zone_vlans = np.zeros(VLAN_SPACE, dtype=bool)
+
+        for dc in sites:
+            if (zone, dc) in recomputed:
+                dc_results, cor_switch_vlans, all_cor_zone_vlans = recomputed[(zone, dc)]
+                block = {"cor_input": cor_inputs[(zone, dc)],
+                         "cor_switch_vlans": cor_switch_vlans,
+                         "all_cor_zone_vlans": all_cor_zone_vlans,
+                         "results": dc_results}
+                xdc_dirty = True
+            else:
+                block = previous["blocks"][(zone, dc)]
+                dc_results = list(block["results"])
+                for i, row in enumerate(dc_results):
+                    if row["Switch_Type"] in ("TOR_PRD", "TOR_MGT") and tor_changed(row["Switch"]):
+                        dc_results[i] = compare_tor_group(dc, zone, [row["Switch"]], matrix,
+                                                          block["all_cor_zone_vlans"], row["Switch_Type"])[0]
+                        patched_tors += 1
+                block = dict(block, results=dc_results)
+
+            state["blocks"][(zone, dc)] = block
+            results.extend(block["results"])
+            if log.isEnabledFor(logging.DEBUG):
+                _log_dc_block(zone, dc, block["results"], block["all_cor_zone_vlans"])
+            xdc_cor_switch_vlans.update(block["cor_switch_vlans"])
+            xdc_all_cor_zone_vlans |= block["all_cor_zone_vlans"]
+
+        if xdc_dirty:
+            xdc_results = []
+            if xdc_cor_switch_vlans and xdc_all_cor_zone_vlans.any():
+                xdc_results = compare_cor_across_dcs(zone, xdc_cor_switch_vlans, xdc_all_cor_zone_vlans,
+                                                     cross_site_label(sites))
+        else:
+            xdc_results = previous["xdc"][zone]
+        state["xdc"][zone] = xdc_results
+        results.extend(xdc_results)
+        if xdc_results and log.isEnabledFor(logging.DEBUG):
+            log.debug("\n--- COR Across DCs (Zone: %s) ---", zone)
+            log.debug("All %s VLANs across ALL DCs (COR union): %s", zone, mask_to_strings(xdc_all_cor_zone_vlans))
+            _log_switch_rows(xdc_results, zone, missing_suffix=" (vs ALL DCs)")
+
+    log.info("\nIncremental comparison: %d zone/DC blocks recomputed, %d TOR rows patched",
+             len(recomputed), patched_tors)
+    return results, state
 
 
 def results_to_dataframe(comparison_results: List[Dict[str, object]]) -> pd.DataFrame:
@@ -346,74 +452,157 @@ def results_to_dataframe(comparison_results: List[Dict[str, object]]) -> pd.Data
     return pd.DataFrame(excel_rows)
 
 
-def main(out_dir: Path = OUTPUT_DIR):
+def zone_vrf_rows(zone_vrf_data: Dict[str, List[Dict[str, str]]]):
+    """The zone's SVI rows flattened to one record per row, with the host as HOSTNAME"""
+    for hostname, rows in zone_vrf_data.items():
+        for row in rows:
+            yield dict(HOSTNAME=hostname, **row)
+
+
+def main(out_dir: Path = OUTPUT_DIR,
+         configs_dir: Path = CONFIGS_DIR,
+         workers: int = DEFAULT_WORKERS,
+         use_cache: bool = True,
+         verify_hash: bool = False,
+         full: bool = False,
+         formats: List[str] = DEFAULT_FORMATS,
+         compression: str = "none",
+         site_workers: int = 1):
     # Ensure output directory exists
     out_dir.mkdir(parents=True, exist_ok=True)
+    report = RunReport("cor_tor_zone_comparison")
 
-    vlan_data = read_vlan_data()
+    with report.stage("discover files") as stage:
+        stage.count(devices=len(get_manifest(configs_dir, refresh=True)))
 
-    print("\n" + "=" * 60)
-    print("=== Processing All Zones to Single Sheet ===")
-    print("=" * 60)
-    print(f"Zones to process: {', '.join(ZONES)}")
+    # Parsed records from earlier runs, reused for files the collector has not touched
+    cache = SnapshotCache(out_dir / CACHE_FILENAME, verify_hash) if use_cache else None
 
-    # Collect all results across all zones
-    all_results = []
+    with report.stage("parse show_vlan") as stage:
+        vlan_data = read_vlan_data(configs_dir, workers, cache)
+        stage.count(files=len(vlan_data), rows=sum(len(vlans) for vlans in vlan_data.values()))
 
-    # Process each zone
-    for zone in ZONES:
-        print(f"\n{'#' * 60}")
-        print(f"### Processing Zone: {zone} ###")
-        print(f"{'#' * 60}")
+    with report.stage("parse show_ip_interface_brief_vrf_all") as stage:
+        vrf_records = read_vrf_records(configs_dir, workers, cache)
+        stage.count(files=len(vrf_records), rows=sum(len(records) for _, records in vrf_records))
 
-        # Read VRF data for this specific zone
-        zone_vrf_data = read_interface_vrf_data_for_zone(zone)
-        if not zone_vrf_data:
-            print(f"No VRF data found for zone: {zone}")
-            continue
+    if cache is not None:
+        log.info(cache.stats())
+        cache.close()
 
-        print(f"Found {len(zone_vrf_data)} switches with {zone} VRFs")
+    compare_and_write(vlan_data, vrf_records, out_dir, report, full, formats, compression, site_workers)
+    report.write(out_dir)
 
-        # Save VRF data for this zone (JSON) - optional individual files
-        zone_filename = zone.replace("-", "").lower()
-        vrf_json_filename = out_dir / f"{zone_filename}_vrf_data.json"
-        with open(vrf_json_filename, "w") as f:
-            json.dump(zone_vrf_data, f, indent=4)
-        print(f"Saved {zone} VRF data to {vrf_json_filename}")
 
-        # Compare VLANs for this zone
-        comparison_results = compare_zone_vlans_tor_vs_cor(vlan_data, zone_vrf_data, zone)
+def compare_and_write(vlan_data: Dict[str, list],
+                      vrf_records: List[Tuple[str, list]],
+                      out_dir: Path,
+                      report: RunReport,
+                      full: bool = False,
+                      formats: List[str] = DEFAULT_FORMATS,
+                      compression: str = "none",
+                      site_workers: int = 1):
+    """
+    Everything after parsing: zone VRF data, the comparison and the reports, timed into report
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
 
-        # Add to overall results
-        all_results.extend(comparison_results)
+    with report.stage("build VLAN matrix") as stage:
+        matrix = VlanMatrix.from_vlan_data(vlan_data)
+        # COR / TOR_PRD / TOR_MGT groups per site, from the switches found in the snapshot
+        switch_types = build_switch_groups(vlan_data)
+        stage.count(devices=len(matrix.hostnames))
+
+    with report.stage("zone classification") as stage:
+        vrf_index = build_vrf_index(ZONES, vrf_records)
+        stage.count(rows=len(vrf_index.rows), vrfs=len({vrf_name for _, vrf_name, _, _ in vrf_index.rows}))
+    for vrf_name, zones in vrf_index.classifier.overlaps().items():
+        log.warning("VRF %s matches zones %s, its SVIs are compared in each", vrf_name, ", ".join(zones))
+
+    log.info("\n%s\n=== Processing All Zones to Single Sheet ===\n%s", "=" * 60, "=" * 60)
+    log.info("Zones to process: %s", ", ".join(ZONES))
+
+    # Save the VRF data for each zone
+    with report.stage("write zone VRF data") as stage:
+        for zone in ZONES:
+            log.info("\n%s\n### Processing Zone: %s ###\n%s", "#" * 60, zone, "#" * 60)
+
+            # VRF data for this specific zone
+            zone_vrf_data = vrf_index.zone_view(zone)
+            if not zone_vrf_data:
+                log.warning("No VRF data found for zone: %s", zone)
+                continue
+
+            log.info("Found %d switches with %s VRFs", len(zone_vrf_data), zone)
+
+            # Save VRF data for this zone, one SVI row per line - optional individual files
+            zone_filename = zone.replace("-", "").lower()
+            vrf_json_filename = ndjson_filename(out_dir / f"{zone_filename}_vrf_data", compression)
+            atomic_write(vrf_json_filename, lambda path: write_ndjson(zone_vrf_rows(zone_vrf_data), path))
+            stage.count(files=1, rows=sum(len(rows) for rows in zone_vrf_data.values()))
+            log.info("Saved %s VRF data to %s", zone, vrf_json_filename)
+
+    # Compare VLANs for every zone, reusing the last run's results for switches whose inputs are unchanged
+    with report.stage("comparison") as stage:
+        state_file = out_dir / STATE_FILENAME
+        previous_state = None if full else load_comparison_state(state_file)
+        all_results, state = compare_zones_incremental(matrix, vrf_index, ZONES, switch_types, previous_state,
+                                                       site_workers)
+        save_comparison_state(state_file, state)
+        stage.count(rows=len(all_results))
 
     # Convert all results to a single DataFrame
     if all_results:
-        df = results_to_dataframe(all_results)
-
-        # Sort by Zone, DC, Switch_Type, then Switch for better organization
-        df = df.sort_values(by=["Zone", "DC", "Switch_Type", "Switch"])
-
-        # Save to single Excel file
-        excel_filename = out_dir / "all_zones_vlan_comparison.xlsx"
-        df.to_excel(excel_filename, index=False, sheet_name="All Zones")
-        print(f"\n✓ Saved all zones comparison to {excel_filename}")
-        print(f"  Total rows: {len(df)}")
-        print(f"  Zones included: {', '.join(df['Zone'].unique())}")
-
-        # Also save as CSV for easier filtering/analysis
-        csv_filename = out_dir / "all_zones_vlan_comparison.csv"
-        df.to_csv(csv_filename, index=False)
-        print(f"✓ Saved CSV version to {csv_filename}")
-
-        # Save consolidated JSON with all results
-        json_filename = out_dir / "all_zones_vlan_comparison.json"
-        with open(json_filename, "w") as f:
-            json.dump(all_results, f, indent=4)
-        print(f"✓ Saved JSON version to {json_filename}")
+        with report.stage("build DataFrame") as stage:
+            df = results_to_dataframe(all_results)
+
+            # Sort by Zone, DC, Switch_Type, then Switch for better organization
+            df = df.sort_values(by=["Zone", "DC", "Switch_Type", "Switch"])
+            stage.count(rows=len(df))
+
+        log.info("\nAll zones comparison: %d rows", len(df))
+        log.info("  Zones included: %s", ", ".join(df["Zone"].unique()))
+
+        # Excel, CSV for easier filtering/analysis and the consolidated JSON, written side by side
+        stem = out_dir / "all_zones_vlan_comparison"
+        tasks = frame_tasks(df, stem, [fmt for fmt in formats if fmt != "json"], index=False,
+                            sheet_name="All Zones")
+        if "json" in formats:
+            tasks.append(ReportTask("json", ndjson_filename(stem, compression),
+                                    lambda path: write_ndjson(all_results, path)))
+        if "parquet" in formats:
+            tasks.append(ReportTask("parquet", stem.with_suffix(".parquet"),
+                                    lambda path: write_parquet(comparison_table(all_results), path)))
+            host_vlans = {hostname: [vlan_id for vlan_id, _ in vlans] for hostname, vlans in vlan_data.items()}
+            tasks.append(ReportTask("parquet", out_dir / "device_vlans.parquet",
+                                    lambda path: write_parquet(device_table(host_vlans), path)))
+        with report.stage("write outputs") as stage:
+            timings = write_reports(tasks)
+            stage.count(files=len(timings))
+        for filename, seconds in timings.items():
+            report.add_timing(f"write {filename.name}", seconds)
     else:
-        print("\nNo results to save.")
+        log.warning("\nNo results to save.")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare zone VLANs between COR and TOR switches")
+    add_input_arguments(parser, CONFIGS_DIR)
+    parser.add_argument("--out-dir", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--full", action="store_true",
+                        help="recompute every comparison instead of only those whose inputs changed")
+    add_site_workers_argument(parser)
+    add_formats_argument(parser, DEFAULT_FORMATS)
+    add_logging_arguments(parser)
+    parser.add_argument("--compress", choices=COMPRESSIONS, default="none",
+                        help="compress the NDJSON outputs (.ndjson.gz / .ndjson.zst)")
+    add_profile_arguments(parser)
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    configure_logging(args.verbose, args.quiet)
+    with profiling(args.out_dir, "cor_tor_zone_comparison", args.profile, args.profile_top):
+        main(args.out_dir, args.configs_dir, args.workers, not args.no_cache, args.verify_hash, args.full,
+             args.formats, args.compress, args.site_workers)
\ No newline at end of file
@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import pandas
+
+# xlsxwriter is optional and preferred; openpyxl (a required module) is the fallback
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+# Largest sheet Excel opens; xlsxwriter silently drops cells past these
+EXCEL_MAX_ROWS = 1048576
+EXCEL_MAX_COLS = 16384
+
+
+def _cell(value):
+    """Plain Python value for a cell, None for anything that should be left blank"""
+    if value is None or value is pandas.NA:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _rows(df: pandas.DataFrame, index: bool):
+    """Header row then one row per record, in frame order, as to_excel lays them out"""
+    header = list(df.columns)
+    if index:
+        header = [df.index.name or ""] + header
+    yield header
+
+    for record in df.itertuples(index=index, name=None):
+        yield [_cell(value) for value in record]
+
+
+def _write_xlsxwriter(df, filename, sheet_name, index):
+    # constant_memory flushes each row to disk once the next one starts, so rows must go in order
+    workbook = xlsxwriter.Workbook(str(filename), {"constant_memory": True})
+    worksheet = workbook.add_worksheet(sheet_name)
+    bold = workbook.add_format({"bold": True})
+
+    for row_number, row in enumerate(_rows(df, index)):
+        for col_number, value in enumerate(row):
+            if value is None:
+                continue
+            if row_number == 0 or (index and col_number == 0):
+                worksheet.write(row_number, col_number, value, bold)
+            else:
+                worksheet.write(row_number, col_number, value)
+    workbook.close()
+
+
+def _write_openpyxl(df, filename, sheet_name, index):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    for row in _rows(df, index):
+        worksheet.append(row)
+    workbook.save(str(filename))
+
+
+def write_excel(df: pandas.DataFrame, filename, sheet_name: str = "Sheet1", index: bool = True):
+    """
+    Writes df to a single-sheet workbook the way DataFrame.to_excel lays it out (header row,
+    optional index column, blank cells for missing values), streaming rows to disk so the
+    whole workbook is never held in memory. Uses xlsxwriter in constant_memory mode when it
+    is installed, otherwise openpyxl in write-only mode.
+    Raises ValueError, as to_excel does, when the frame does not fit on one sheet.
+    """
+    num_rows = len(df) + 1
+    num_cols = len(df.columns) + (1 if index else 0)
+    if num_rows > EXCEL_MAX_ROWS or num_cols > EXCEL_MAX_COLS:
+        raise ValueError(f"This sheet is too large! Your sheet size is: {num_rows}, {num_cols} "
+                         f"Max sheet size is: {EXCEL_MAX_ROWS}, {EXCEL_MAX_COLS}")
+
+    if xlsxwriter is not None:
+        _write_xlsxwriter(df, filename, sheet_name, index)
+    else:
+        _write_openpyxl(df, filename, sheet_name, index)
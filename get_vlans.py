@@ -2,26 +2,23 @@ import sys
 from pathlib import Path
 import pandas as pd
 import csv
-import glob
-import json
 import openpyxl
 
+from config_scanner import get_command_files
+from json_backend import load_json_file
 
+CONFIGS_DIR = Path("C:\\scripts\\vlan_script")
 
-def get_file_list():
-    search = "C:\\scripts\\vlan_script\\**\\show_vlan.json"
-    return glob.glob(search, recursive=True)
 
-def read_files():
-    filenames = get_file_list()
-    vlan_map = {}
+def get_file_list(configs_dir=CONFIGS_DIR):
+    return get_command_files(configs_dir, "show_vlan")
 
-    for filename in filenames:
-        with open(filename, "r") as f:
-            vlans = json.load(f)
+def read_files(configs_dir=CONFIGS_DIR):
+    files = get_file_list(configs_dir)
+    vlan_map = {}
 
-        split_file_path = filename.split("\\")
-        hostname = split_file_path[3]
+    for hostname, filename in files:
+        vlans = load_json_file(filename)
 
         # Normalize hostname to lowercase for filtering
         hostname_lower = hostname.lower()
@@ -0,0 +1,97 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from json_backend import iter_json_items, load_json_file
+from snapshot_cache import SnapshotCache
+
+# ProcessPoolExecutor raises ValueError for more than 61 workers on Windows
+MAX_WORKERS = 61 if sys.platform == "win32" else None
+
+# Worker processes used to parse device files, override with the scripts' workers argument
+DEFAULT_WORKERS = min(os.cpu_count() or 1, MAX_WORKERS or sys.maxsize)
+
+# (vlan_id, vlan_name)
+VlanRecord = Tuple[str, str]
+# (interface, vrf, ip_address)
+SviRecord = Tuple[str, str, str]
+# (tag, interface name, zone, fwd, ip)
+FirewallRecord = Tuple[str, str, str, str, str]
+
+# Where the interface list sits in a PAN-OS show_interface_all.json, and the keys we use from it
+FIREWALL_INTERFACE_PATH = ["response", "result", "ifnet", "entry"]
+FIREWALL_INTERFACE_FIELDS = ("tag", "name", "zone", "fwd", "ip")
+
+
+def parse_vlan_file(filename: str) -> List[VlanRecord]:
+    """
+    show_vlan.json -> sorted unique (VLAN_ID, VLAN_NAME) with the id as a string
+    """
+    vlans = load_json_file(filename)
+    return sorted({(str(v['VLAN_ID']), v.get('VLAN_NAME', '')) for v in vlans},
+                  key=lambda x: int(x[0]))
+
+
+def parse_vrf_file(filename: str) -> List[SviRecord]:
+    """
+    show_ip_interface_brief_vrf_all.json -> (INTERFACE, VRF, IP_ADDRESS) for Vlan interfaces only
+    """
+    vrfs = load_json_file(filename)
+    return [(v['INTERFACE'], v.get('VRF', ''), v.get('IP_ADDRESS', ''))
+            for v in vrfs if "Vlan" in v.get('INTERFACE', '')]
+
+
+def iter_firewall_interfaces(filename: str):
+    """
+    Streams the ifnet entries of a PAN-OS show_interface_all.json, keeping only the fields we use
+    """
+    return iter_json_items(filename, FIREWALL_INTERFACE_PATH, FIREWALL_INTERFACE_FIELDS)
+
+
+def parse_firewall_file(filename: str) -> List[FirewallRecord]:
+    """
+    PAN-OS show_interface_all.json -> (tag, name, zone, fwd, ip) for tagged sub-interfaces only
+    """
+    interfaces = iter_firewall_interfaces(filename)
+    return [(i['tag'], i.get('name', ''), i.get('zone', ''), i.get('fwd', ''), i.get('ip', ''))
+            for i in interfaces if 'tag' in i and i['tag'] != '0']
+
+
+def _parse_all(parser: Callable[[str], list], filenames: List[str], workers: int) -> List[list]:
+    if workers <= 1 or len(filenames) < 2:
+        return list(map(parser, filenames))
+
+    workers = min(workers, len(filenames), MAX_WORKERS or len(filenames))
+    chunksize = max(1, len(filenames) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(parser, filenames, chunksize=chunksize))
+
+
+def ingest_files(files: List[Tuple[str, str]],
+                 parser: Callable[[str], list],
+                 workers: int = DEFAULT_WORKERS,
+                 cache: Optional[SnapshotCache] = None
+                 ) -> List[Tuple[str, list]]:
+    """
+    Runs parser over every (hostname, filename) and returns (hostname, records) in the same order
+    as files, so the merge in the caller is deterministic whatever the worker count.
+    With workers <= 1 the files are parsed in this process. With a cache, only files that
+    changed since they were last parsed are sent to the parser.
+    """
+    hostnames = [hostname for hostname, _ in files]
+    filenames = [filename for _, filename in files]
+
+    if cache is None:
+        return list(zip(hostnames, _parse_all(parser, filenames, workers)))
+
+    records = [cache.get(parser.__name__, filename) for filename in filenames]
+    stale = [i for i, r in enumerate(records) if r is None]
+
+    parsed = _parse_all(parser, [filenames[i] for i in stale], workers)
+    for i, file_records in zip(stale, parsed):
+        records[i] = file_records
+        cache.put(parser.__name__, filenames[i], file_records)
+    cache.commit()
+
+    return list(zip(hostnames, records))
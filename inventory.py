@@ -0,0 +1,128 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple
+
+# Site codes we compare, taken from the third field of a switch hostname (TU-VIC-DC1-L0-SW-COR-PRD-01).
+# Extend the pattern when new site codes come online.
+SITE_TOKEN_PATTERN = r"DC\d+"
+
+# TU-VIC-DC1-L0-SW-COR-PRD-01 -> site DC1, role COR, env PRD, index 1
+_switch_re = re.compile(
+    rf"^[^-]+-[^-]+-(?P<site>{SITE_TOKEN_PATTERN})-[^-]+-SW-(?P<role>[A-Z]+)-(?P<env>[A-Z]+)-(?P<index>\d+)\b"
+)
+# Anything else at a known site, e.g. a router, still gets its site
+_switch_site_re = re.compile(rf"^[^-]+-[^-]+-(?P<site>{SITE_TOKEN_PATTERN})-")
+
+# Firewalls are named after the building rather than the site (TUVIC-MIT-PA-DCFW1)
+FIREWALL_SITES = {
+    "MIT": "DC1",
+    "BKH": "DC2",
+}
+_firewall_re = re.compile(r"^[^-]+-(?P<building>[^-]+)-PA-DCFW(?P<index>\d+)\b")
+
+UNKNOWN_SITE = "UNKNOWN"
+FIREWALL_ROLE = "FW"
+
+# Order of roles within a site in the reports
+ROLE_ORDER = ["COR", FIREWALL_ROLE, "ACC", "OOB", "TOR"]
+
+# Switch groups used by the COR/TOR comparison, group name -> (role, env)
+ROLE_GROUPS = {
+    "Core": ("COR", "PRD"),
+    "TOR_MGT": ("TOR", "MGT"),
+    "TOR_PRD": ("TOR", "PRD"),
+}
+
+
+class DeviceInfo(NamedTuple):
+    hostname: str
+    site: str
+    role: str
+    env: str
+    index: int
+
+
+@lru_cache(maxsize=None)
+def classify_hostname(hostname: str) -> DeviceInfo:
+    """
+    Splits a hostname into (site, role, env, index). Parts that cannot be worked out are
+    blank, UNKNOWN for the site and -1 for the index. Results are cached per hostname.
+    """
+    match = _switch_re.match(hostname)
+    if match:
+        return DeviceInfo(hostname, match["site"], match["role"], match["env"], int(match["index"]))
+
+    match = _firewall_re.match(hostname)
+    if match:
+        site = FIREWALL_SITES.get(match["building"], UNKNOWN_SITE)
+        return DeviceInfo(hostname, site, FIREWALL_ROLE, "", int(match["index"]))
+
+    match = _switch_site_re.match(hostname)
+    if match:
+        return DeviceInfo(hostname, match["site"], "", "", -1)
+
+    return DeviceInfo(hostname, UNKNOWN_SITE, "", "", -1)
+
+
+def classify_hostnames(hostnames: Iterable[str]) -> Dict[str, DeviceInfo]:
+    """Classifies each distinct hostname once"""
+    return {hostname: classify_hostname(hostname) for hostname in dict.fromkeys(hostnames)}
+
+
+def switch_site(hostname: str) -> str:
+    """Site code of a switch hostname, or UNKNOWN"""
+    info = classify_hostname(hostname)
+    return UNKNOWN_SITE if info.role == FIREWALL_ROLE else info.site
+
+
+def firewall_site(hostname: str) -> str:
+    """Site code of a firewall hostname, or UNKNOWN"""
+    info = classify_hostname(hostname)
+    return info.site if info.role == FIREWALL_ROLE else UNKNOWN_SITE
+
+
+def is_firewall(hostname: str) -> bool:
+    return classify_hostname(hostname).role == FIREWALL_ROLE
+
+
+def site_sort_key(site: str):
+    """Orders DC2 before DC10"""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", site)]
+
+
+def device_sort_key(info: DeviceInfo):
+    """Site, then role (ROLE_ORDER, unknown roles last), env, index"""
+    role_rank = ROLE_ORDER.index(info.role) if info.role in ROLE_ORDER else len(ROLE_ORDER)
+    return site_sort_key(info.site), role_rank, info.role, info.env, info.index, info.hostname
+
+
+def discover_sites(hostnames: Iterable[str]) -> List[str]:
+    """Sorted site codes of every hostname that belongs to a known site"""
+    sites = {info.site for info in classify_hostnames(hostnames).values()}
+    sites.discard(UNKNOWN_SITE)
+    return sorted(sites, key=site_sort_key)
+
+
+def build_switch_groups(hostnames: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Groups switches as {site}_{group} for each group in ROLE_GROUPS, e.g. DC1_Core, DC1_TOR_PRD,
+    with the switches of a group in index order
+    """
+    groups: Dict[str, List[str]] = {}
+    for info in sorted(classify_hostnames(hostnames).values(), key=device_sort_key):
+        if info.site == UNKNOWN_SITE:
+            continue
+        for group, (role, env) in ROLE_GROUPS.items():
+            if info.role == role and info.env == env:
+                groups.setdefault(f"{info.site}_{group}", []).append(info.hostname)
+    return groups
+
+
+def core_switches_by_site(hostnames: Iterable[str]) -> Dict[str, List[str]]:
+    """Site -> its core (COR-PRD) switches, sites in order"""
+    role, env = ROLE_GROUPS["Core"]
+    cores: Dict[str, List[str]] = {}
+    for info in sorted(classify_hostnames(hostnames).values(), key=device_sort_key):
+        if info.site != UNKNOWN_SITE and info.role == role and info.env == env:
+            cores.setdefault(info.site, []).append(info.hostname)
+    return cores
@@ -0,0 +1,103 @@
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+# Fast decoders are optional, the stdlib json module is always available as a fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Set VLAN_JSON_BACKEND=json (or orjson / simdjson) to force a decoder
+BACKEND_ENV_VAR = "VLAN_JSON_BACKEND"
+
+
+def _simdjson_loads(data: bytes) -> Any:
+    # simdjson hands back lazy proxy objects, convert to plain dicts/lists for the callers
+    parsed = simdjson.Parser().parse(data)
+    return parsed.as_dict() if isinstance(parsed, simdjson.Object) else parsed.as_list()
+
+
+def _build_backends() -> Dict[str, Callable[[bytes], Any]]:
+    backends: Dict[str, Callable[[bytes], Any]] = {}
+    if orjson is not None:
+        backends["orjson"] = orjson.loads
+    if simdjson is not None:
+        backends["simdjson"] = _simdjson_loads
+    backends["json"] = json.loads
+    return backends
+
+
+_backends = _build_backends()
+_backend_name = os.environ.get(BACKEND_ENV_VAR) or next(iter(_backends))
+if _backend_name not in _backends:
+    _backend_name = "json"
+
+
+def available_backends() -> List[str]:
+    return list(_backends)
+
+
+def loads(data: bytes, backend: str = None) -> Any:
+    """
+    Decode a JSON document with the selected backend.
+    Some collector output contains NaN, which the fast decoders reject, so anything
+    they refuse is retried with the stdlib decoder.
+    """
+    name = backend or _backend_name
+    try:
+        return _backends[name](data)
+    except ValueError:
+        if name == "json":
+            raise
+        return json.loads(data)
+
+
+def load_json_file(filename, backend: str = None) -> Any:
+    """
+    Read a JSON file as bytes and decode it
+    """
+    with open(filename, "rb") as f:
+        data = f.read()
+    return loads(data, backend)
+
+
+def iter_json_items(filename, path: List[str], fields: Iterable[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the objects in the array found at path, e.g. ["response", "result", "ifnet", "entry"].
+    With ijson installed the file is streamed, so only one item is held in memory at a time;
+    otherwise the whole document is decoded and walked. When fields is given only those keys
+    are kept from each item.
+    """
+    keep = set(fields) if fields is not None else None
+    streamed = 0
+
+    if ijson is not None:
+        try:
+            with open(filename, "rb") as f:
+                # use_float gives float rather than Decimal for numbers, matching the other decoders
+                items = ijson.items(f, ".".join(path) + ".item", use_float=True)
+                for item in items:
+                    yield item if keep is None else {k: v for k, v in item.items() if k in keep}
+                    streamed += 1
+            return
+        except ijson.common.JSONError:
+            # ijson rejects NaN and has no option to allow it; decode the whole file instead,
+            # skipping the items already yielded
+            pass
+
+    document = load_json_file(filename)
+    for key in path:
+        document = document[key]
+    for item in document[streamed:]:
+        yield item if keep is None else {k: v for k, v in item.items() if k in keep}
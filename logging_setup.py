@@ -0,0 +1,16 @@
+import argparse
+import logging
+import sys
+
+
+def add_logging_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("-v", "--verbose", action="store_true",
+                       help="log every host and every switch's Has/Missing VLANs")
+    group.add_argument("-q", "--quiet", action="store_true", help="only log warnings and errors")
+
+
+def configure_logging(verbose: bool = False, quiet: bool = False):
+    """INFO by default, DEBUG with verbose, WARNING with quiet; plain messages on stdout as print gave"""
+    level = logging.DEBUG if verbose else logging.WARNING if quiet else logging.INFO
+    logging.basicConfig(level=level, format="%(message)s", stream=sys.stdout, force=True)
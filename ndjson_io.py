@@ -0,0 +1,87 @@
+import gzip
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator
+
+from json_backend import loads
+
+# Faster encoder and zstd compression are optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIONS = ["none", "gzip", "zstd"]
+_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def ndjson_filename(stem, compression: str = "none") -> Path:
+    """e.g. all_zones_vlan_comparison -> all_zones_vlan_comparison.ndjson.gz for gzip"""
+    return Path(f"{stem}.ndjson{_SUFFIXES.get(compression, '')}")
+
+
+def _dumps(record: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record)
+    return json.dumps(record, separators=(",", ":")).encode()
+
+
+@contextmanager
+def _open(filename, mode: str):
+    """Binary file object for filename, compressed according to its .gz / .zst suffix"""
+    filename = Path(filename)
+    if filename.suffix == ".gz":
+        with gzip.open(filename, mode, compresslevel=6) as f:
+            yield f
+    elif filename.suffix == ".zst":
+        if zstandard is None:
+            raise RuntimeError("zstd compression needs zstandard, install it with: pip install zstandard")
+        with open(filename, mode) as raw:
+            if "w" in mode:
+                with zstandard.ZstdCompressor().stream_writer(raw, closefd=False) as f:
+                    yield f
+            else:
+                with zstandard.ZstdDecompressor().stream_reader(raw, closefd=False) as reader:
+                    yield _iter_lines(reader)
+    else:
+        with open(filename, mode) as f:
+            yield f
+
+
+def _iter_lines(reader, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+    # The zstd reader does not split lines itself
+    pending = b""
+    for chunk in iter(lambda: reader.read(chunk_size), b""):
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def write_ndjson(records: Iterable[Dict[str, Any]], filename) -> int:
+    """
+    Writes one JSON object per line, encoding and writing each record as it comes so the
+    whole document is never built in memory. Compressed when filename ends in .gz or .zst.
+    Returns the number of records written.
+    """
+    count = 0
+    with _open(filename, "wb") as f:
+        for record in records:
+            f.write(_dumps(record) + b"\n")
+            count += 1
+    return count
+
+
+def read_ndjson(filename) -> Iterator[Dict[str, Any]]:
+    """Yields the records of a file written by write_ndjson, plain or compressed"""
+    with _open(filename, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
@@ -0,0 +1,109 @@
+import argparse
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TOP = 25
+
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.005
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the Python stack of every thread but its own at a fixed interval and counts each distinct
+    stack, root first, for a collapsed-stack (flamegraph.pl / speedscope) file. Unlike cProfile it
+    also sees the report writer threads, and its overhead does not grow with the number of calls.
+    Worker processes are not sampled.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write_collapsed(self, filename: Path):
+        with open(filename, "w") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--profile", action="store_true",
+                        help="profile the run, writing .pstats and a collapsed-stack flamegraph file to the out dir")
+    parser.add_argument("--profile-top", type=int, default=DEFAULT_TOP, metavar="N",
+                        help=f"hot functions listed at the end of a profiled run (default {DEFAULT_TOP})")
+
+
+@contextmanager
+def profiling(out_dir: Path, name: str, enabled: bool = True, top: int = DEFAULT_TOP) -> Iterator[None]:
+    """
+    Runs the block under cProfile and the stack sampler, then writes {name}.pstats and
+    {name}.collapsed.txt to out_dir and logs the top functions by own time. Does nothing unless enabled.
+
+        with profiling(args.out_dir, "svi_fw_vlan_comparison", args.profile, args.profile_top):
+            main(...)
+    """
+    if not enabled:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    sampler = StackSampler()
+    sampler.start()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        sampler.stop()
+
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        pstats_filename = out_dir / f"{name}.pstats"
+        collapsed_filename = out_dir / f"{name}.collapsed.txt"
+        profiler.dump_stats(str(pstats_filename))
+        sampler.write_collapsed(collapsed_filename)
+
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).strip_dirs().sort_stats("tottime").print_stats(top)
+        log.info("\n=== Top %d functions by own time ===%s", top, summary.getvalue())
+        log.info("Profile saved to %s and %s (%d samples)", pstats_filename, collapsed_filename,
+                 sum(sampler.stacks.values()))
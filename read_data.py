@@ -1,33 +1,35 @@
+import argparse
+import logging
 import pandas
-import glob
-import json
+from pathlib import Path
 
+from config_scanner import get_command_files
+from ingest import iter_firewall_interfaces
+from json_backend import load_json_file
+from logging_setup import add_logging_arguments, configure_logging
 
-def get_file_list():
-    search = r"C:\scripts\vlan_script\configs\**\show_vlan.json"
-    files = glob.glob(search, recursive=True)
-    return files
+CONFIGS_DIR = Path(r"C:\scripts\vlan_script\configs")
 
+log = logging.getLogger(__name__)
 
-def get_file_list_firewalls():
-    search = r"C:\scripts\vlan_script\configs\**\show_interface_all.json"
-    files = glob.glob(search, recursive=True)
-    return files
 
+def get_file_list(configs_dir=CONFIGS_DIR):
+    return get_command_files(configs_dir, "show_vlan")
 
-def read_files():
-    filenames = get_file_list()
+
+def get_file_list_firewalls(configs_dir=CONFIGS_DIR):
+    return get_command_files(configs_dir, "show_interface_all")
+
+
+def read_files(configs_dir=CONFIGS_DIR):
+    files = get_file_list(configs_dir)
     results = {}
     hostnames = {"DC1", "DC2"}
 
-    for filename in filenames:
-        print(f"Reading {filename}")
-
-        with open(filename, "r") as f:
-            vlans = json.load(f)
+    for hostname, filename in files:
+        log.debug("Reading %s", filename)
 
-        split_file_path = filename.split("\\")
-        hostname = split_file_path[4]
+        vlans = load_json_file(filename)
 
         if "TU-VIC-DC1" not in hostname and "TU-NSW-DC2" not in hostname:
             continue
@@ -42,10 +44,10 @@ def read_files():
         else:
             FWDC = "DC2"
 
-        print(hostname)
+        log.debug(hostname)
         hostnames.add(hostname)
-        ids = [v['VLAN_ID'] for v in vlans]
-        print(ids)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug([v['VLAN_ID'] for v in vlans])
 
         for v in vlans:
             vlan_id = v['VLAN_ID']
@@ -58,19 +60,13 @@ def read_files():
     return results, hostnames
 
 
-def read_files_firewalls():
-    filenames = get_file_list_firewalls()
+def read_files_firewalls(configs_dir=CONFIGS_DIR):
+    files = get_file_list_firewalls(configs_dir)
     results = {}
     hostnames = {"DC1", "DC2"}
 
-    for filename in filenames:
-        print(f"Reading {filename}")
-
-        with open(filename, "r") as f:
-            response = json.load(f)
-
-        split_file_path = filename.split("\\")
-        hostname = split_file_path[4]
+    for hostname, filename in files:
+        log.debug("Reading %s", filename)
 
         if "DCFW" not in hostname:
             continue
@@ -82,9 +78,9 @@ def read_files_firewalls():
         else:
             continue
 
-        interfaces = response['response']['result']['ifnet']['entry']
+        interfaces = iter_firewall_interfaces(filename)
 
-        print(hostname)
+        log.debug(hostname)
         hostnames.add(hostname)
 
         for interface in interfaces:
@@ -112,15 +108,15 @@ def parse_results(results):
     return results
 
 
-def main():
-    results, hostnames = read_files()
+def main(configs_dir=CONFIGS_DIR):
+    results, hostnames = read_files(configs_dir)
     results = parse_results(results)
 
     columns = sorted(hostnames)
     df = pandas.DataFrame.from_dict(results, orient="index")
     df.to_csv("switches.csv", columns=columns)
 
-    results, hostnames = read_files_firewalls()
+    results, hostnames = read_files_firewalls(configs_dir)
     results = parse_results(results)
 
     columns = sorted(hostnames)
@@ -129,5 +125,14 @@ def main():
     df.to_csv("firewalls.csv", columns=columns)
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="VLAN presence per switch and per firewall, DC1 vs DC2")
+    parser.add_argument("--configs-dir", type=Path, default=CONFIGS_DIR)
+    add_logging_arguments(parser)
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    configure_logging(args.verbose, args.quiet)
+    main(args.configs_dir)
@@ -0,0 +1,114 @@
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+# pandas, the Excel writers and pyarrow are imported when a report needs them, so that
+# importing this module (e.g. for the vlandiff argument parser) stays cheap
+if TYPE_CHECKING:
+    import pandas
+
+log = logging.getLogger(__name__)
+
+REPORT_FORMATS = ["csv", "xlsx", "json", "parquet"]
+
+
+class ReportTask(NamedTuple):
+    format: str
+    filename: Path
+    write: Callable[[Path], None]  # writes the report to the path it is given
+
+
+def parse_formats(value: str) -> List[str]:
+    """argparse type for --formats, e.g. "csv,json" """
+    formats = [fmt.strip().lower() for fmt in value.split(",") if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in REPORT_FORMATS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown format(s) {', '.join(unknown)}, choose from {', '.join(REPORT_FORMATS)}"
+        )
+    if "parquet" in formats:
+        from arrow_output import parquet_available
+        if not parquet_available():
+            raise argparse.ArgumentTypeError("parquet output needs pyarrow, install it with: pip install pyarrow")
+    return formats
+
+
+def add_formats_argument(parser: argparse.ArgumentParser, default: Optional[List[str]] = REPORT_FORMATS):
+    """With default None, --formats is None unless given and each report uses its own defaults"""
+    default_help = "each report's own" if default is None else ",".join(default)
+    parser.add_argument("--formats", type=parse_formats, default=None if default is None else list(default),
+                        help=f"comma separated report formats to write, from {', '.join(REPORT_FORMATS)} "
+                             f"(default {default_help})")
+
+
+def atomic_write(filename: Path, write: Callable[[Path], None]):
+    """
+    Writes through a temporary file next to filename and renames it into place, so readers never
+    see a half-written report. The temporary name keeps the extension for writers that check it.
+    """
+    filename = Path(filename)
+    tmp_filename = filename.with_name(f"{filename.stem}.tmp{filename.suffix}")
+    try:
+        write(tmp_filename)
+        os.replace(tmp_filename, filename)
+    finally:
+        if tmp_filename.exists():
+            tmp_filename.unlink()
+
+
+def _write_xlsx(df: "pandas.DataFrame", path: Path, sheet_name: str, index: bool):
+    from excel_writer import write_excel
+    write_excel(df, path, sheet_name=sheet_name, index=index)
+
+
+def frame_tasks(df: "pandas.DataFrame",
+                stem: Path,
+                formats: Iterable[str],
+                index: bool = True,
+                sheet_name: str = "Sheet1") -> List[ReportTask]:
+    """
+    One task per requested format for writing df to stem.csv / stem.xlsx / stem.json.
+    JSON is keyed by row index then column, like the nested dicts the frames are built from.
+    Parquet is not written from the report frames; the scripts write their own typed tables.
+    """
+    stem = Path(stem)
+    writers = {
+        "csv": lambda path: df.to_csv(path, index=index),
+        "xlsx": lambda path: _write_xlsx(df, path, sheet_name, index),
+        "json": lambda path: df.to_json(path, orient="index" if index else "records"),
+    }
+    return [ReportTask(fmt, stem.with_suffix(f".{fmt}"), writers[fmt]) for fmt in formats if fmt in writers]
+
+
+def write_reports(tasks: List[ReportTask], workers: int = None) -> Dict[Path, float]:
+    """
+    Writes every report concurrently on a thread pool, each one atomically, and prints how long
+    each took. Returns filename -> seconds. The first writer error is raised once all have finished.
+    """
+    def run(task: ReportTask) -> float:
+        start = time.perf_counter()
+        atomic_write(task.filename, task.write)
+        return time.perf_counter() - start
+
+    if not tasks:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=workers or len(tasks)) as pool:
+        futures = [pool.submit(run, task) for task in tasks]
+
+    timings = {}
+    for task, future in zip(tasks, futures):
+        if future.exception() is None:
+            timings[task.filename] = future.result()
+            log.info("✓ Saved %s to %s (%.2fs)", task.format.upper(), task.filename, timings[task.filename])
+        else:
+            log.error("✗ Failed to write %s: %s", task.filename, future.exception())
+
+    for future in futures:
+        if future.exception() is not None:
+            raise future.exception()
+    return timings
@@ -0,0 +1,62 @@
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config_scanner import get_command_files, get_manifest
+from ingest import DEFAULT_WORKERS, ingest_files, parse_firewall_file, parse_vlan_file, parse_vrf_file
+from snapshot_cache import SnapshotCache
+from stage_timer import RunReport, Stage
+
+VLAN_COMMAND = "show_vlan"
+VRF_COMMAND = "show_ip_interface_brief_vrf_all"
+FIREWALL_COMMAND = "show_interface_all"
+
+
+class Snapshot:
+    """
+    One configs tree, parsed once for every report run against it. Each command's files are parsed
+    (through the parsed-file cache when given) the first time a report asks for them, for every
+    device; the reports pick out the devices they compare.
+
+        snapshot = Snapshot(configs_dir, workers, cache, report)
+        vlan_data = site_vlan_data(snapshot.vlan_records)
+    """
+
+    def __init__(self,
+                 configs_dir: Path,
+                 workers: int = DEFAULT_WORKERS,
+                 cache: Optional[SnapshotCache] = None,
+                 report: Optional[RunReport] = None):
+        self.configs_dir = Path(configs_dir)
+        self.workers = workers
+        self.cache = cache
+        self.report = report
+        self._records: Dict[str, List[Tuple[str, list]]] = {}
+
+        with self._stage("discover files") as stage:
+            stage.count(devices=len(get_manifest(self.configs_dir, refresh=True)))
+
+    def _stage(self, name: str):
+        # Timed into the run report when there is one
+        return self.report.stage(name) if self.report is not None else nullcontext(Stage(name))
+
+    def records(self, command: str, parser: Callable[[str], list]) -> List[Tuple[str, list]]:
+        """(hostname, records) for every device with the command file, parsed on first use"""
+        if command not in self._records:
+            files = get_command_files(self.configs_dir, command)
+            with self._stage(f"parse {command}") as stage:
+                self._records[command] = ingest_files(files, parser, self.workers, self.cache)
+                stage.count(files=len(files), rows=sum(len(records) for _, records in self._records[command]))
+        return self._records[command]
+
+    @property
+    def vlan_records(self) -> List[Tuple[str, list]]:
+        return self.records(VLAN_COMMAND, parse_vlan_file)
+
+    @property
+    def vrf_records(self) -> List[Tuple[str, list]]:
+        return self.records(VRF_COMMAND, parse_vrf_file)
+
+    @property
+    def firewall_records(self) -> List[Tuple[str, list]]:
+        return self.records(FIREWALL_COMMAND, parse_firewall_file)
@@ -0,0 +1,97 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+CACHE_FILENAME = "parsed_cache.sqlite"
+
+# Bump when the shape of the records returned by the ingest parsers changes
+CACHE_VERSION = 1
+
+
+def file_digest(filename) -> str:
+    h = hashlib.sha1()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class SnapshotCache:
+    """
+    On-disk store of parsed device records, keyed by file path and parser name.
+    An entry is reused while the file's size and mtime are unchanged. With verify_hash
+    the content hash is checked as well, and a file whose mtime moved but whose content
+    did not (e.g. re-copied by the collector) is still a hit.
+    """
+
+    def __init__(self, db_path, verify_hash: bool = False):
+        self.db_path = Path(db_path)
+        self.verify_hash = verify_hash
+        self.hits = 0
+        self.misses = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or int(row[0]) != CACHE_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS records")
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(CACHE_VERSION),))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            " path TEXT, parser TEXT, size INTEGER, mtime REAL, digest TEXT, data BLOB,"
+            " PRIMARY KEY (path, parser))"
+        )
+        self.conn.commit()
+
+    def get(self, parser: str, filename) -> Optional[list]:
+        """
+        Returns the cached records for the file, or None if it is missing or stale
+        """
+        path = str(filename)
+        stat = os.stat(path)
+        row = self.conn.execute(
+            "SELECT size, mtime, digest, data FROM records WHERE path = ? AND parser = ?", (path, parser)
+        ).fetchone()
+
+        if row is not None:
+            size, mtime, digest, data = row
+            if self.verify_hash:
+                unchanged = size == stat.st_size and digest is not None and digest == file_digest(path)
+                if unchanged and mtime != stat.st_mtime:
+                    self.conn.execute("UPDATE records SET mtime = ? WHERE path = ? AND parser = ?",
+                                      (stat.st_mtime, path, parser))
+            else:
+                unchanged = size == stat.st_size and mtime == stat.st_mtime
+            if unchanged:
+                self.hits += 1
+                return pickle.loads(data)
+
+        self.misses += 1
+        return None
+
+    def put(self, parser: str, filename, records: list):
+        path = str(filename)
+        stat = os.stat(path)
+        # The file was just parsed so it is warm in the OS cache, hashing it here is cheap
+        digest = file_digest(path)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?)",
+            (path, parser, stat.st_size, stat.st_mtime, digest,
+             pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL))
+        )
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        rate = f"{100 * self.hits / total:.0f}%" if total else "n/a"
+        return f"cache {self.db_path}: {self.hits} hits, {self.misses} misses ({rate} hit rate)"
@@ -0,0 +1,147 @@
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# resource is Unix only; Windows reads the peak working set through psapi instead
+try:
+    import resource
+except ImportError:
+    resource = None
+
+log = logging.getLogger(__name__)
+
+RUN_REPORT_FILENAME = "run_report.json"
+
+
+def _windows_peak_rss() -> Optional[int]:
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+            (name, ctypes.c_size_t) for name in (
+                "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")
+        ]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return None
+    return counters.PeakWorkingSetSize
+
+
+def peak_rss_bytes(children: bool = False) -> Optional[int]:
+    """
+    Peak resident set size so far of this process, or with children=True of the largest finished
+    child process (the parse workers). None where it cannot be read.
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
+    if sys.platform == "win32" and not children:
+        try:
+            return _windows_peak_rss()
+        except (AttributeError, OSError):
+            return None
+    return None
+
+
+def _cpu_seconds() -> float:
+    # This process plus finished child processes; child times read as 0 on Windows
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _mb(value: Optional[int]) -> Optional[float]:
+    return None if value is None else round(value / (1 << 20), 1)
+
+
+class Stage:
+    """One timed stage; counts such as files or rows are added with count()"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counts: Dict[str, int] = {}
+        self.wall_s = 0.0
+        self.cpu_s: Optional[float] = None
+        # How far the stage raised the process's peak RSS; 0 when it stayed under an earlier peak
+        self.rss_growth_mb: Optional[float] = None
+
+    def count(self, **counts: int):
+        for key, value in counts.items():
+            self.counts[key] = self.counts.get(key, 0) + value
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"name": self.name, "wall_s": round(self.wall_s, 4),
+                "cpu_s": None if self.cpu_s is None else round(self.cpu_s, 4),
+                "rss_growth_mb": self.rss_growth_mb, **self.counts}
+
+
+class RunReport:
+    """
+    Collects per-stage wall time, CPU time, counts and peak RSS growth for one run, written as run_report.json:
+
+        report = RunReport("cor_tor_zone_comparison")
+        with report.stage("parse show_vlan") as stage:
+            vlan_data = read_vlan_data(...)
+            stage.count(files=len(vlan_data))
+        report.write(out_dir)
+    """
+
+    def __init__(self, script: str):
+        self.script = script
+        self.started = datetime.now()
+        self._start = time.perf_counter()
+        self.stages: List[Stage] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Stage]:
+        stage = Stage(name)
+        wall_start = time.perf_counter()
+        cpu_start = _cpu_seconds()
+        peak_start = peak_rss_bytes()
+        try:
+            yield stage
+        finally:
+            stage.wall_s = time.perf_counter() - wall_start
+            stage.cpu_s = _cpu_seconds() - cpu_start
+            peak_end = peak_rss_bytes()
+            if peak_start is not None and peak_end is not None:
+                stage.rss_growth_mb = _mb(peak_end - peak_start)
+            self.stages.append(stage)
+            log.debug("%s: %.2fs wall, %.2fs CPU, %s", name, stage.wall_s, stage.cpu_s, stage.counts)
+
+    def add_timing(self, name: str, wall_s: float, **counts: int):
+        """A stage timed elsewhere, e.g. one report file written on a thread, with no CPU figure"""
+        stage = Stage(name)
+        stage.wall_s = wall_s
+        stage.count(**counts)
+        self.stages.append(stage)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "script": self.script,
+            "started": self.started.isoformat(timespec="seconds"),
+            "total_wall_s": round(time.perf_counter() - self._start, 4),
+            "peak_rss_mb": _mb(peak_rss_bytes()),
+            "peak_child_rss_mb": _mb(peak_rss_bytes(children=True)),
+            "stages": [stage.to_dict() for stage in self.stages],
+        }
+
+    def write(self, out_dir: Path) -> Path:
+        filename = Path(out_dir) / RUN_REPORT_FILENAME
+        tmp_filename = filename.with_name(filename.name + ".tmp")
+        with open(tmp_filename, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_filename, filename)
+        log.info("Run report saved to %s", filename)
+        return filename
@@ -1,6 +1,27 @@
+import argparse
+import logging
+import numpy as np
 import pandas
-import glob
-import json
+from pathlib import Path
+
+from arrow_output import vlan_facts_table, write_parquet
+from cli_args import add_input_arguments
+from config_scanner import get_command_files, get_manifest
+from ingest import DEFAULT_WORKERS, ingest_files, parse_firewall_file, parse_vlan_file, parse_vrf_file
+from inventory import (UNKNOWN_SITE, FIREWALL_ROLE, classify_hostname, classify_hostnames, core_switches_by_site,
+                       device_sort_key, discover_sites, firewall_site, is_firewall)
+from logging_setup import add_logging_arguments, configure_logging
+from profiling import add_profile_arguments, profiling
+from report_output import ReportTask, add_formats_argument, frame_tasks, write_reports
+from snapshot_cache import CACHE_FILENAME, SnapshotCache
+from stage_timer import RunReport
+from vlan_matrix import VlanMatrix
+from zone_classifier import ZoneClassifier
+
+log = logging.getLogger(__name__)
+
+CONFIGS_DIR = Path(r"C:\vlan_script_functions\configs")
+OUTPUT_DIR = Path("..")
 
 # Define zones and their VRF name patterns
 ZONES = {
@@ -9,95 +30,84 @@ ZONES = {
     "ITS": ["ITS"],
     "CORPORATE": ["corporate"]
 }
+ZONE_CLASSIFIER = ZoneClassifier(ZONES)
 
+# Reports written unless --formats says otherwise
+DEFAULT_FORMATS = ["csv", "xlsx"]
 
-def get_vlan_file_list():
-    search = r"C:\vlan_script_functions\configs\**\show_vlan.json"
-    files = glob.glob(search, recursive=True)
-    return files
+# Flattened SVI / firewall columns per device, {hostname}_svi_<field> and {hostname}_fw_<field>
+SVI_FIELDS = ("interface", "vrf", "ip")
+FW_FIELDS = ("interface", "zone", "fwd", "ip")
+# Fields with few distinct values, stored as categoricals
+CATEGORY_FIELDS = {"vrf", "zone", "fwd"}
 
 
-def get_core_sw_file_list():
-    search = r"C:\vlan_script_functions\configs\**\show_ip_interface_brief_vrf_all.json"
-    files = glob.glob(search, recursive=True)
-    return files
+def get_vlan_file_list(configs_dir=CONFIGS_DIR):
+    return get_command_files(configs_dir, "show_vlan")
 
 
-def get_firewall_file_list():
-    search = r"C:\vlan_script_functions\configs\**\show_interface_all.json"
-    files = glob.glob(search, recursive=True)
-    return files
+def get_core_sw_file_list(configs_dir=CONFIGS_DIR):
+    return get_command_files(configs_dir, "show_ip_interface_brief_vrf_all")
 
 
-def get_zone_from_vrf(vrf_name):
-    """Determine which zone a VRF belongs to"""
-    if not vrf_name:
-        return ""
+def get_firewall_file_list(configs_dir=CONFIGS_DIR):
+    return get_command_files(configs_dir, "show_interface_all")
 
-    vrf_upper = vrf_name.upper()
 
-    for zone, patterns in ZONES.items():
-        for pattern in patterns:
-            if pattern.upper() in vrf_upper:
-                return zone
-    return ""
+def get_zone_from_vrf(vrf_name):
+    """Determine which zone a VRF belongs to, the first in ZONES order if it matches more than one"""
+    return ZONE_CLASSIFIER.first(vrf_name)
 
 
-def read_vlan_files():
-    filenames = get_vlan_file_list()
-    results = {}
+def _is_site_switch(hostname):
+    info = classify_hostname(hostname)
+    return info.site != UNKNOWN_SITE and info.role != FIREWALL_ROLE
 
-    for filename in filenames:
-        print(f"Reading {filename}")
 
-        with open(filename, "r") as f:
-            vlans = json.load(f)
+def read_vlan_files(configs_dir=CONFIGS_DIR, workers=DEFAULT_WORKERS, cache=None):
+    files = [(hostname, filename) for hostname, filename in get_vlan_file_list(configs_dir)
+             if _is_site_switch(hostname)]
+    return vlan_results(ingest_files(files, parse_vlan_file, workers, cache))
 
-        split_file_path = filename.split("\\")
-        hostname = split_file_path[3]
 
-        if "TU-VIC-DC1" not in hostname and "TU-NSW-DC2" not in hostname:
-            continue
+def vlan_results(vlan_records):
+    """VLAN -> hostname -> {'has_vlan': True} for the site switches among (hostname, VLAN records)"""
+    results = {}
 
-        print(hostname)
+    for hostname, vlans in vlan_records:
+        if not _is_site_switch(hostname):
+            continue
+        log.debug(hostname)
 
-        for v in vlans:
-            vlan_id = v['VLAN_ID']
+        for vlan_id, _ in vlans:
             if vlan_id not in results:
                 results[vlan_id] = {}
-            if hostname not in results[vlan_id]:
-                results[vlan_id][hostname] = {}
             results[vlan_id][hostname] = {'has_vlan': True}
 
     return results
 
 
-def read_core_switch_files(results):
-    filenames = get_core_sw_file_list()
-    vlan_zones = {}  # Track zone for each VLAN
+def read_core_switch_files(results, configs_dir=CONFIGS_DIR, workers=DEFAULT_WORKERS, cache=None):
+    files = [(hostname, filename) for hostname, filename in get_core_sw_file_list(configs_dir)
+             if _is_core_switch(hostname)]
+    return add_core_svis(results, ingest_files(files, parse_vrf_file, workers, cache))
 
-    for filename in filenames:
-        print(f"Reading {filename}")
 
-        with open(filename, "r") as f:
-            vlans = json.load(f)
+def _is_core_switch(hostname):
+    return _is_site_switch(hostname) and classify_hostname(hostname).role == "COR"
 
-        split_file_path = filename.split("\\")
-        hostname = split_file_path[3]
 
-        if "COR" not in hostname:
-            continue
+def add_core_svis(results, svi_records):
+    """Adds the core switches' SVIs to results, returning it with VLAN -> zone"""
+    vlan_zones = {}  # Track zone for each VLAN
 
-        if "TU-VIC-DC1" not in hostname and "TU-NSW-DC2" not in hostname:
+    for hostname, svis in svi_records:
+        if not _is_core_switch(hostname):
             continue
+        log.debug(hostname)
 
-        print(hostname)
-
-        for v in vlans:
-            if "Vlan" not in v['INTERFACE']:
-                continue
-            vlan_id = v['INTERFACE'].replace('Vlan', '')
-            vrf_name = v.get('VRF', '')
+        for interface, vrf_name, ip in svis:
+            vlan_id = interface.replace('Vlan', '')
 
             # Determine zone from VRF
             zone = get_zone_from_vrf(vrf_name)
@@ -108,247 +118,217 @@ def read_core_switch_files(results):
                 results[vlan_id] = {}
             if hostname not in results[vlan_id]:
                 results[vlan_id][hostname] = {}
-            results[vlan_id][hostname]['sw_interface'] = v['INTERFACE']
-            results[vlan_id][hostname]['sw_vrf'] = v['VRF']
-            results[vlan_id][hostname]['sw_ip'] = v['IP_ADDRESS']
+            results[vlan_id][hostname]['sw_interface'] = interface
+            results[vlan_id][hostname]['sw_vrf'] = vrf_name
+            results[vlan_id][hostname]['sw_ip'] = ip
+
+    for vrf_name, zones in ZONE_CLASSIFIER.overlaps().items():
+        log.warning("VRF %s matches zones %s, using %s", vrf_name, ", ".join(zones), zones[0])
 
     return results, vlan_zones
 
 
-def read_files_firewalls(results):
-    filenames = get_firewall_file_list()
+def read_files_firewalls(results, configs_dir=CONFIGS_DIR, workers=DEFAULT_WORKERS, cache=None):
+    files = [(hostname, filename) for hostname, filename in get_firewall_file_list(configs_dir)
+             if _is_site_firewall(hostname)]
+    return add_firewall_interfaces(results, ingest_files(files, parse_firewall_file, workers, cache))
 
-    for filename in filenames:
-        print(f"Reading {filename}")
 
-        with open(filename, "r") as f:
-            response = json.load(f)
+def _is_site_firewall(hostname):
+    return firewall_site(hostname) != UNKNOWN_SITE
 
-        split_file_path = filename.split("\\")
-        hostname = split_file_path[3]
 
-        if "MIT" not in hostname and "BKH" not in hostname:
+def add_firewall_interfaces(results, firewall_records):
+    """Adds the site firewalls' tagged interfaces to results"""
+    for hostname, interfaces in firewall_records:
+        if not _is_site_firewall(hostname):
             continue
-        if "DCFW" not in hostname:
-            continue
-
-        interfaces = response['response']['result']['ifnet']['entry']
+        log.debug(hostname)
 
-        print(hostname)
-
-        for interface in interfaces:
-            if 'tag' not in interface or interface['tag'] == '0':
-                continue
-            vlan_id = interface['tag']
+        for vlan_id, name, zone, fwd, ip in interfaces:
             if vlan_id not in results:
                 results[vlan_id] = {}
             if hostname not in results[vlan_id]:
                 results[vlan_id][hostname] = {}
-            results[vlan_id][hostname]['fw_interface'] = interface['name']
-            results[vlan_id][hostname]['fw_zone'] = interface['zone']
-            results[vlan_id][hostname]['fw_fwd'] = interface['fwd']
-            results[vlan_id][hostname]['fw_ip'] = interface['ip']
+            results[vlan_id][hostname]['fw_interface'] = name
+            results[vlan_id][hostname]['fw_zone'] = zone
+            results[vlan_id][hostname]['fw_fwd'] = fwd
+            results[vlan_id][hostname]['fw_ip'] = ip
     return results
 
 
 def parse_results(results, vlan_zones):
     """
-    Parse results and set DC1/DC2 to True only if BOTH core switches in that DC have the VLAN
-    Show blank instead of False
-    Add Zone column
+    Builds the report frame, one row per VLAN (sorted), in a single pass over the results:
+    - Zone column
+    - one nullable boolean presence column per switch, blank where the switch does not have the VLAN
+    - SVI and firewall details flattened into {hostname}_svi_<field> / {hostname}_fw_<field> columns
+    - each DC (DC1, DC2, ...) True only if ALL core switches in that DC have the VLAN, otherwise blank
     """
-    parsed_results = {}
+    vlans = sorted(results)
+    row_of = {vlan: i for i, vlan in enumerate(vlans)}
+    n = len(vlans)
 
-    # Define the core switches for each DC
-    dc1_core_switches = {
-        "TU-VIC-DC1-L0-SW-COR-PRD-01",
-        "TU-VIC-DC1-L0-SW-COR-PRD-02"
-    }
+    presence = {}  # hostname -> bool array over the VLAN rows
+    details = {}  # column -> list of values over the VLAN rows, None where missing
 
-    dc2_core_switches = {
-        "TU-NSW-DC2-L0-SW-COR-PRD-01",
-        "TU-NSW-DC2-L0-SW-COR-PRD-02"
-    }
+    # Every (device, VLAN) that appears in the results, for the DC checks below
+    host_vlans = {}
 
     for vlan, vlan_data in results.items():
-        if vlan not in parsed_results:
-            parsed_results[vlan] = {}
-
-        # Add Zone column
-        parsed_results[vlan]["Zone"] = vlan_zones.get(vlan, "")
-
-        # Track which core switches have this VLAN
-        dc1_cores_with_vlan = set()
-        dc2_cores_with_vlan = set()
-
+        i = row_of[vlan]
         for hostname, device_data in vlan_data.items():
-            # Track core switches
-            if hostname in dc1_core_switches:
-                dc1_cores_with_vlan.add(hostname)
-            elif hostname in dc2_core_switches:
-                dc2_cores_with_vlan.add(hostname)
+            host_vlans.setdefault(hostname, []).append(vlan)
 
             # Firewall Data
-            if "DCFW" in hostname:
-                parsed_results[vlan][f"{hostname}_fw_info"] = {
-                    'interface': device_data["fw_interface"],
-                    'zone': device_data["fw_zone"],
-                    'fwd': device_data["fw_fwd"],
-                    'ip': device_data["fw_ip"]
-                }
+            if is_firewall(hostname):
+                for field in FW_FIELDS:
+                    details.setdefault(f"{hostname}_fw_{field}", [None] * n)[i] = device_data[f"fw_{field}"]
             else:
                 if "has_vlan" in device_data:
-                    parsed_results[vlan][hostname] = device_data["has_vlan"]
+                    presence.setdefault(hostname, np.zeros(n, dtype=bool))[i] = device_data["has_vlan"]
                 if "sw_interface" in device_data:
-                    parsed_results[vlan][f"{hostname}_svi_info"] = {
-                        'interface': device_data["sw_interface"],
-                        'vrf': device_data["sw_vrf"],
-                        'ip': device_data["sw_ip"]
-                    }
-
-        # Set DC1 to True ONLY if BOTH DC1 core switches have this VLAN, otherwise blank
-        dc1_has_all = (dc1_cores_with_vlan == dc1_core_switches)
-        parsed_results[vlan]["DC1"] = True if dc1_has_all else ""
+                    for field in SVI_FIELDS:
+                        details.setdefault(f"{hostname}_svi_{field}", [None] * n)[i] = device_data[f"sw_{field}"]
 
-        # Set DC2 to True ONLY if BOTH DC2 core switches have this VLAN, otherwise blank
-        dc2_has_all = (dc2_cores_with_vlan == dc2_core_switches)
-        parsed_results[vlan]["DC2"] = True if dc2_has_all else ""
+    columns = {"Zone": pandas.Categorical([vlan_zones.get(vlan, "") for vlan in vlans])}
 
-    return parsed_results
+    # The core switches of each DC, found from the devices in the results
+    core_switches_by_dc = core_switches_by_site(host_vlans)
 
+    # A DC is True for a VLAN ONLY if ALL of its core switches have it, otherwise blank
+    matrix = VlanMatrix.from_host_vlans(host_vlans)
+    vlan_ids = np.array([int(vlan) for vlan in vlans], dtype=np.intp)
+    for dc, core_switches in core_switches_by_dc.items():
+        columns[dc] = _presence_array(matrix.all_of(core_switches)[vlan_ids])
 
-def get_ordered_columns():
-    """
-    Returns the columns in the specific order:
-    1. Zone, DC1, DC2
-    2. DC1 Core switches and their _svi_info
-    3. DC2 Core switches and their _svi_info
-    4. Firewall info
-    5. Other switches (ACC, OOB, TOR-MGT, TOR-PRD, etc.)
-    """
-    ordered_columns = [
-        "Zone",
-        "DC1",
-        "DC2",
-        # DC1 Core switches with svi_info
-        "TU-VIC-DC1-L0-SW-COR-PRD-01",
-        "TU-VIC-DC1-L0-SW-COR-PRD-01_svi_info",
-        "TU-VIC-DC1-L0-SW-COR-PRD-02",
-        "TU-VIC-DC1-L0-SW-COR-PRD-02_svi_info",
-        # DC2 Core switches with svi_info
-        "TU-NSW-DC2-L0-SW-COR-PRD-01",
-        "TU-NSW-DC2-L0-SW-COR-PRD-01_svi_info",
-        "TU-NSW-DC2-L0-SW-COR-PRD-02",
-        "TU-NSW-DC2-L0-SW-COR-PRD-02_svi_info",
-        # Firewall info
-        "TUVIC-MIT-PA-DCFW1_fw_info",
-        "TUNSW-BKH-PA-DCFW1_fw_info",
-        # DC2 ACC switches
-        "TU-NSW-DC2-L0-SW-ACC-PRD-01",
-        "TU-NSW-DC2-L0-SW-ACC-PRD-02",
-        "TU-NSW-DC2-L0-SW-ACC-PRD-03",
-        "TU-NSW-DC2-L0-SW-ACC-PRD-04",
-        "TU-NSW-DC2-L0-SW-ACC-PRD-05",
-        "TU-NSW-DC2-L0-SW-ACC-PRD-06",
-        # DC2 OOB switches
-        "TU-NSW-DC2-L0-SW-OOB-PRD-01",
-        "TU-NSW-DC2-L0-SW-OOB-PRD-02",
-        # DC2 TOR-MGT switches
-        "TU-NSW-DC2-L0-SW-TOR-MGT-01",
-        "TU-NSW-DC2-L0-SW-TOR-MGT-02",
-        "TU-NSW-DC2-L0-SW-TOR-MGT-03",
-        "TU-NSW-DC2-L0-SW-TOR-MGT-04",
-        "TU-NSW-DC2-L0-SW-TOR-MGT-05",
-        "TU-NSW-DC2-L0-SW-TOR-MGT-06",
-        "TU-NSW-DC2-L0-SW-TOR-MGT-07",
-        "TU-NSW-DC2-L0-SW-TOR-MGT-08",
-        "TU-NSW-DC2-L0-SW-TOR-MGT-09",
-        # DC2 TOR-PRD switches
-        "TU-NSW-DC2-L0-SW-TOR-PRD-01",
-        "TU-NSW-DC2-L0-SW-TOR-PRD-02",
-        "TU-NSW-DC2-L0-SW-TOR-PRD-03",
-        "TU-NSW-DC2-L0-SW-TOR-PRD-04",
-        "TU-NSW-DC2-L0-SW-TOR-PRD-05",
-        "TU-NSW-DC2-L0-SW-TOR-PRD-06",
-        "TU-NSW-DC2-L0-SW-TOR-PRD-07",
-        "TU-NSW-DC2-L0-SW-TOR-PRD-09",
-        "TU-NSW-DC2-L0-SW-TOR-PRD-10",
-        # DC1 TOR-MGT switches
-        "TU-VIC-DC1-L0-SW-TOR-MGT-01",
-        "TU-VIC-DC1-L0-SW-TOR-MGT-02",
-        "TU-VIC-DC1-L0-SW-TOR-MGT-03",
-        "TU-VIC-DC1-L0-SW-TOR-MGT-04",
-        "TU-VIC-DC1-L0-SW-TOR-MGT-05",
-        # DC1 TOR-PRD switches
-        "TU-VIC-DC1-L0-SW-TOR-PRD-01",
-        "TU-VIC-DC1-L0-SW-TOR-PRD-02",
-        "TU-VIC-DC1-L0-SW-TOR-PRD-03",
-        "TU-VIC-DC1-L0-SW-TOR-PRD-04",
-        "TU-VIC-DC1-L0-SW-TOR-PRD-05",
-        "TU-VIC-DC1-L0-SW-TOR-PRD-06",
-        "TU-VIC-DC1-L0-SW-TOR-PRD-07",
-    ]
-
-    return ordered_columns
-
+    for hostname, has_vlan in presence.items():
+        columns[hostname] = _presence_array(has_vlan)
 
-def main():
-    results = read_vlan_files()
-    results, vlan_zones = read_core_switch_files(results)
-    results = read_files_firewalls(results)
+    for column, values in details.items():
+        field = column.rsplit("_", 1)[1]
+        columns[column] = pandas.Categorical(values) if field in CATEGORY_FIELDS else pandas.array(values, dtype="string")
 
-    # Parse results with zone information
-    results = parse_results(results, vlan_zones)
+    return pandas.DataFrame(columns, index=pandas.Index(vlans))
 
-    # Get the ordered columns list
-    ordered_columns = get_ordered_columns()
 
-    # Columns orientation (VLANs as rows, devices as columns)
-    df = pandas.DataFrame.from_dict(results, orient="index")
+def _presence_array(has_vlan):
+    # True where set and <NA> (written as a blank cell) elsewhere
+    return pandas.arrays.BooleanArray(has_vlan, ~has_vlan)
 
-    # Reorder columns to match the specified order
-    # Only include columns that exist in the dataframe
-    existing_columns = [col for col in ordered_columns if col in df.columns]
 
-    # Add any remaining columns that weren't in our ordered list
-    remaining_columns = [col for col in df.columns if col not in existing_columns]
-    final_columns = existing_columns + remaining_columns
-
-    df = df[final_columns]
-    df = df.sort_index()
-
-    filename = "../results_columns_orientation.csv"
-    df.to_csv(filename)
-    print(f"Results saved to {filename}")
+def get_ordered_columns(hostnames):
+    """
+    Returns the columns in the specific order:
+    1. Zone, then one column per DC (DC1, DC2, ...)
+    2. Core switches of each DC and their _svi_ columns
+    3. Firewall _fw_ columns
+    4. Other switches (ACC, OOB, TOR-MGT, TOR-PRD, etc.) by DC, role and number
+    """
+    devices = sorted(classify_hostnames(hostnames).values(), key=device_sort_key)
 
-    # Also save as Excel for better readability
-    filename_excel = "../results_columns_orientation.xlsx"
-    df.to_excel(filename_excel)
-    print(f"Results saved to {filename_excel}")
+    ordered_columns = ["Zone"] + discover_sites(hostnames)
 
-    # Index orientation (devices as rows, VLANs as columns) - with ordered rows
-    df_transposed = pandas.DataFrame.from_dict(results)
-    df_transposed = df_transposed.sort_index()
+    core_columns = set()
+    for core_switches in core_switches_by_site(hostnames).values():
+        for core_switch in core_switches:
+            ordered_columns.append(core_switch)
+            ordered_columns.extend(f"{core_switch}_svi_{field}" for field in SVI_FIELDS)
+            core_columns.add(core_switch)
 
-    # Reorder rows to match the specified order
-    # Only include rows that exist in the dataframe
-    existing_rows = [row for row in ordered_columns if row in df_transposed.index]
+    for device in devices:
+        if device.role == FIREWALL_ROLE:
+            ordered_columns.extend(f"{device.hostname}_fw_{field}" for field in FW_FIELDS)
 
-    # Add any remaining rows that weren't in our ordered list
-    remaining_rows = [row for row in df_transposed.index if row not in existing_rows]
-    final_rows = existing_rows + remaining_rows
+    ordered_columns.extend(device.hostname for device in devices
+                           if device.role != FIREWALL_ROLE and device.hostname not in core_columns)
 
-    df_transposed = df_transposed.reindex(final_rows)
+    return ordered_columns
 
-    filename = "../results_index_orientation.csv"
-    df_transposed.to_csv(filename)
-    print(f"Results saved to {filename}")
 
-    # Also save as Excel for better readability
-    filename_excel = "../results_index_orientation.xlsx"
-    df_transposed.to_excel(filename_excel)
-    print(f"Results saved to {filename_excel}")
+def order_columns(columns, ordered_columns):
+    """
+    Sorts columns by their position in ordered_columns, with columns not in it after them by name
+    """
+    rank = {column: i for i, column in enumerate(ordered_columns)}
+    unlisted = len(rank)
+    return sorted(columns, key=lambda column: (rank.get(column, unlisted), column))
+
+
+def main(configs_dir=CONFIGS_DIR, workers=DEFAULT_WORKERS, out_dir=OUTPUT_DIR, use_cache=True, verify_hash=False,
+         formats=DEFAULT_FORMATS):
+    out_dir = Path(out_dir)
+    report = RunReport("svi_fw_vlan_comparison")
+
+    with report.stage("discover files") as stage:
+        stage.count(devices=len(get_manifest(configs_dir, refresh=True)))
+
+    # Parsed records from earlier runs, reused for files the collector has not touched
+    cache = SnapshotCache(out_dir / CACHE_FILENAME, verify_hash) if use_cache else None
+
+    with report.stage("parse show_vlan") as stage:
+        results = read_vlan_files(configs_dir, workers, cache)
+        stage.count(vlans=len(results))
+    with report.stage("parse SVIs and zone classification") as stage:
+        results, vlan_zones = read_core_switch_files(results, configs_dir, workers, cache)
+        stage.count(vlans=len(vlan_zones))
+    with report.stage("parse firewall interfaces") as stage:
+        results = read_files_firewalls(results, configs_dir, workers, cache)
+        stage.count(vlans=len(results))
+
+    if cache is not None:
+        log.info(cache.stats())
+        cache.close()
+
+    write_report(results, vlan_zones, out_dir, report, formats)
+    report.write(out_dir)
+
+
+def write_report(results, vlan_zones, out_dir, report, formats=DEFAULT_FORMATS):
+    """Builds the report frame from the merged results and writes both orientations, timed into report"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with report.stage("build DataFrame") as stage:
+        # Get the ordered columns list from the devices found
+        ordered_columns = get_ordered_columns({hostname for vlan_data in results.values() for hostname in vlan_data})
+
+        # Columns orientation (VLANs as rows, devices as columns), with zone information
+        df = parse_results(results, vlan_zones)
+
+        # Reorder columns to match the specified order, any columns not in it go last
+        df = df[order_columns(df.columns, ordered_columns)]
+
+        # Index orientation (devices as rows, VLANs as columns) - rows keep the column order above
+        df_transposed = df.T
+        stage.count(rows=len(df), columns=len(df.columns))
+
+    # Both orientations in every requested format, written side by side
+    tasks = (frame_tasks(df, out_dir / "results_columns_orientation", formats)
+             + frame_tasks(df_transposed, out_dir / "results_index_orientation", formats))
+    if "parquet" in formats:
+        # One row per (VLAN, device) rather than the wide report layout
+        tasks.append(ReportTask("parquet", out_dir / "vlan_facts.parquet",
+                                lambda path: write_parquet(vlan_facts_table(results, vlan_zones), path)))
+    with report.stage("write outputs") as stage:
+        timings = write_reports(tasks)
+        stage.count(files=len(timings))
+    for filename, seconds in timings.items():
+        report.add_timing(f"write {filename.name}", seconds)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="VLAN, SVI and firewall comparison across all switches")
+    add_input_arguments(parser, CONFIGS_DIR)
+    parser.add_argument("--out-dir", type=Path, default=OUTPUT_DIR)
+    add_formats_argument(parser, DEFAULT_FORMATS)
+    add_logging_arguments(parser)
+    add_profile_arguments(parser)
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    configure_logging(args.verbose, args.quiet)
+    with profiling(args.out_dir, "svi_fw_vlan_comparison", args.profile, args.profile_top):
+        main(args.configs_dir, args.workers, args.out_dir, not args.no_cache, args.verify_hash, args.formats)
\ No newline at end of file
@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config_scanner import get_command_files, scan_config_tree
+
+
+def test_only_json_files_are_commands(tmp_path):
+    host_dir = tmp_path / "TU-VIC-DC1-L0-SW-TOR-PRD-01"
+    host_dir.mkdir()
+    # Sorts before show_vlan.json, and used to take its place in the manifest
+    (host_dir / "show_vlan.bak").write_text("not json")
+    (host_dir / "show_vlan.csv").write_text("VLAN_ID,VLAN_NAME")
+    (host_dir / "show_vlan.json").write_text('[{"VLAN_ID": 10, "VLAN_NAME": "ten"}]')
+    (host_dir / "notes.txt").write_text("")
+
+    manifest = scan_config_tree(tmp_path)
+
+    assert list(manifest[host_dir.name]) == ["show_vlan"]
+    assert get_command_files(tmp_path, "show_vlan") == [(host_dir.name, str(host_dir / "show_vlan.json"))]
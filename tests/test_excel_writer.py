@@ -0,0 +1,22 @@
+import sys
+from pathlib import Path
+
+import pandas
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from excel_writer import EXCEL_MAX_COLS, write_excel
+
+
+def test_too_many_columns_raises(tmp_path):
+    # The columns orientation has one column per device, so a large estate can pass Excel's limit
+    df = pandas.DataFrame([range(EXCEL_MAX_COLS)])
+    filename = tmp_path / "results.xlsx"
+
+    with pytest.raises(ValueError, match="too large"):
+        write_excel(df, filename)
+    assert not filename.exists()
+
+    write_excel(df, filename, index=False)
+    assert filename.exists()
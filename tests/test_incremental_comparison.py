@@ -0,0 +1,60 @@
+import json
+import logging
+import pickle
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import cor_tor_zone_comparison as cor_tor
+from generate_configs import generate_config_tree
+
+REPORT = "all_zones_vlan_comparison.csv"
+
+
+def run(configs_dir: Path, out_dir: Path, full: bool = False) -> str:
+    cor_tor.main(out_dir, configs_dir, workers=1, use_cache=False, full=full, formats=["csv"])
+    return (out_dir / REPORT).read_text()
+
+
+def drop_vlans(configs_dir: Path, hostname: str, count: int):
+    filename = configs_dir / hostname / "show_vlan.json"
+    vlans = json.loads(filename.read_text())
+    filename.write_text(json.dumps(vlans[count:]))
+
+
+def test_incremental_run_matches_full_run(tmp_path, caplog):
+    configs_dir = tmp_path / "configs"
+    generate_config_tree(configs_dir, cor=2, tor_prd=3, tor_mgt=2, vlans=120)
+    out_dir = tmp_path / "incremental"
+    before = run(configs_dir, out_dir)
+
+    # One TOR (only its rows are patched) and one COR (its zone/DC blocks are recomputed)
+    drop_vlans(configs_dir, "TU-NSW-DC2-L0-SW-TOR-PRD-02", 20)
+    drop_vlans(configs_dir, "TU-VIC-DC1-L0-SW-COR-PRD-01", 20)
+
+    caplog.clear()
+    with caplog.at_level(logging.INFO, logger=cor_tor.__name__):
+        incremental = run(configs_dir, out_dir)
+    summary = next(r.getMessage() for r in caplog.records if "Incremental comparison" in r.getMessage())
+    full = run(configs_dir, tmp_path / "full", full=True)
+    assert incremental != before
+    assert incremental == full
+    assert " 0 TOR rows patched" not in summary and " 0 zone/DC blocks" not in summary
+
+
+def test_unusable_state_means_full_run(tmp_path):
+    state_file = tmp_path / cor_tor.STATE_FILENAME
+    assert cor_tor.load_comparison_state(state_file) is None
+
+    # Refers to a class that no longer exists
+    state_file.write_bytes(b"cvlan_matrix\nNoSuchClass\n.")
+    assert cor_tor.load_comparison_state(state_file) is None
+
+    state_file.write_bytes(pickle.dumps(["not", "a", "dict"]))
+    assert cor_tor.load_comparison_state(state_file) is None
+
+    state_file.write_bytes(b"truncated")
+    assert cor_tor.load_comparison_state(state_file) is None
@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ingest import parse_firewall_file
+
+
+def test_firewall_file_with_nan(tmp_path):
+    # Collector output can hold bare NaN, which json.loads accepts and ijson does not
+    filename = tmp_path / "show_interface_all.json"
+    filename.write_text(
+        '{"response": {"@status": "success", "result": {"ifnet": {"entry": ['
+        '{"name": "ae1.10", "tag": "10", "zone": "ITS", "fwd": "vr:default", "ip": "10.0.0.1/24"}, '
+        '{"name": "ethernet1/1", "tag": "0", "zone": "", "fwd": "N/A", "ip": "N/A", "id": NaN}, '
+        '{"name": "ae1.20", "tag": "20", "zone": "MSS", "fwd": "vr:default", "ip": "10.0.1.1/24"}'
+        ']}, "hw": {"entry": []}}}}'
+    )
+
+    assert parse_firewall_file(str(filename)) == [
+        ("10", "ae1.10", "ITS", "vr:default", "10.0.0.1/24"),
+        ("20", "ae1.20", "MSS", "vr:default", "10.0.1.1/24"),
+    ]
@@ -0,0 +1,25 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vrf_index import VrfIndex
+
+
+def test_zone_view_of_other_zone_leaves_index_unchanged():
+    index = VrfIndex(["MSS"])
+    index.add_host("TU-VIC-DC1-L0-SW-COR-PRD-01", [
+        ("Vlan10", "MSS-PRD", "10.0.0.1/24"),
+        ("Vlan20", "EA-BMS", "10.0.1.1/24"),
+        ("Vlan30", "MSS-EA-SHARED", "10.0.2.1/24"),
+    ])
+    classifier = index.classifier
+
+    ea = index.zone_view("EA-")
+    bms = index.zone_view("BMS")
+
+    assert [row["VLAN_ID"] for row in ea["TU-VIC-DC1-L0-SW-COR-PRD-01"]] == ["20", "30"]
+    assert [row["VLAN_ID"] for row in bms["TU-VIC-DC1-L0-SW-COR-PRD-01"]] == ["20"]
+    assert index.zones == ["MSS"]
+    assert index.classifier is classifier
+    assert [row["VLAN_ID"] for row in index.zone_view("MSS")["TU-VIC-DC1-L0-SW-COR-PRD-01"]] == ["10", "30"]
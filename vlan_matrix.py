@@ -0,0 +1,65 @@
+from typing import Dict, Iterable, List, Tuple, Union
+
+import numpy as np
+
+VLAN_SPACE = 4096
+
+
+def mask_to_strings(mask: np.ndarray) -> List[str]:
+    """VLAN IDs set in a mask, as strings in numeric order"""
+    return [str(vlan_id) for vlan_id in np.flatnonzero(mask).tolist()]
+
+
+class VlanMatrix:
+    """
+    Device x VLAN boolean matrix, one row per hostname and one column per VLAN ID (0-4095).
+    Hosts that were never added read as an all-False row, the same as a switch with no VLANs.
+    """
+
+    def __init__(self, hostnames: Iterable[str]):
+        self.hostnames = list(hostnames)
+        self.index: Dict[str, int] = {hostname: i for i, hostname in enumerate(self.hostnames)}
+        # Last row stays empty and stands in for unknown hosts
+        self.data = np.zeros((len(self.hostnames) + 1, VLAN_SPACE), dtype=bool)
+
+    @classmethod
+    def from_host_vlans(cls, host_vlans: Dict[str, Iterable[Union[int, str]]]) -> "VlanMatrix":
+        """
+        Builds the matrix from hostname -> VLAN IDs
+        """
+        matrix = cls(host_vlans)
+        for hostname, vlan_ids in host_vlans.items():
+            matrix.set_vlans(hostname, vlan_ids)
+        return matrix
+
+    @classmethod
+    def from_vlan_data(cls, vlan_data: Dict[str, List[Tuple[str, str]]]) -> "VlanMatrix":
+        """
+        Builds the presence matrix from read_vlan_data output (hostname -> [(VLAN_ID, VLAN_NAME)])
+        """
+        return cls.from_host_vlans({hostname: [vlan_id for vlan_id, _ in vlans]
+                                    for hostname, vlans in vlan_data.items()})
+
+    def set_vlans(self, hostname: str, vlan_ids: Iterable[Union[int, str]]):
+        ids = [int(vlan_id) for vlan_id in vlan_ids]
+        if ids:
+            self.data[self.index[hostname], ids] = True
+
+    def row_indexes(self, hostnames: List[str]) -> np.ndarray:
+        missing = len(self.hostnames)
+        return np.fromiter((self.index.get(hostname, missing) for hostname in hostnames),
+                           dtype=np.intp, count=len(hostnames))
+
+    def rows(self, hostnames: List[str]) -> np.ndarray:
+        """(len(hostnames), 4096) block for the given hosts, in that order"""
+        return self.data[self.row_indexes(hostnames)]
+
+    def subset(self, hostnames: List[str]) -> "VlanMatrix":
+        """A smaller matrix holding only the given hosts, e.g. to ship one site's switches to a worker"""
+        matrix = VlanMatrix(hostnames)
+        matrix.data[:-1] = self.rows(matrix.hostnames)
+        return matrix
+
+    def all_of(self, hostnames: List[str]) -> np.ndarray:
+        """VLANs present on every one of the hosts"""
+        return self.rows(hostnames).all(axis=0)
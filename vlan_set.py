@@ -0,0 +1,89 @@
+from typing import Iterable, Iterator, List, Union
+
+MAX_VLAN_ID = 4095
+
+
+class VlanSet:
+    """
+    Set of VLAN IDs (0-4095) held as the bits of one Python int, so union, intersection and
+    difference are single big-int operations and iteration is always in numeric order.
+    Accepts VLAN IDs as ints or numeric strings.
+    """
+    __slots__ = ("bits",)
+
+    def __init__(self, vlan_ids: Iterable[Union[int, str]] = ()):
+        bits = 0
+        for vlan_id in vlan_ids:
+            bits |= 1 << _check(int(vlan_id))
+        self.bits = bits
+
+    @classmethod
+    def from_bits(cls, bits: int) -> "VlanSet":
+        vlan_set = cls.__new__(cls)
+        vlan_set.bits = bits
+        return vlan_set
+
+    def __or__(self, other: "VlanSet") -> "VlanSet":
+        return VlanSet.from_bits(self.bits | other.bits)
+
+    def __and__(self, other: "VlanSet") -> "VlanSet":
+        return VlanSet.from_bits(self.bits & other.bits)
+
+    def __sub__(self, other: "VlanSet") -> "VlanSet":
+        return VlanSet.from_bits(self.bits & ~other.bits)
+
+    union = __or__
+    intersection = __and__
+    difference = __sub__
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, VlanSet) and self.bits == other.bits
+
+    def __hash__(self) -> int:
+        return hash(self.bits)
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def __len__(self) -> int:
+        return bin(self.bits).count("1")
+
+    def __contains__(self, vlan_id: Union[int, str]) -> bool:
+        vlan_id = int(vlan_id)
+        return 0 <= vlan_id <= MAX_VLAN_ID and (self.bits >> vlan_id) & 1 == 1
+
+    def __iter__(self) -> Iterator[int]:
+        bits = self.bits
+        while bits:
+            lowest = bits & -bits
+            yield lowest.bit_length() - 1
+            bits ^= lowest
+
+    def __repr__(self) -> str:
+        return f"VlanSet({self.format_ranges()!r})"
+
+    def to_strings(self) -> List[str]:
+        """VLAN IDs as strings in numeric order, the form the reports use"""
+        return [str(vlan_id) for vlan_id in self]
+
+    def format_ranges(self) -> str:
+        """e.g. '10-12,20,30-31'"""
+        ranges = []
+        start = prev = None
+        for vlan_id in self:
+            if start is None:
+                start = prev = vlan_id
+            elif vlan_id == prev + 1:
+                prev = vlan_id
+            else:
+                ranges.append(str(start) if start == prev else f"{start}-{prev}")
+                start = prev = vlan_id
+        if start is not None:
+            ranges.append(str(start) if start == prev else f"{start}-{prev}")
+        return ",".join(ranges)
+
+
+def _check(vlan_id: int) -> int:
+    if not 0 <= vlan_id <= MAX_VLAN_ID:
+        raise ValueError(f"VLAN ID {vlan_id} is outside 0-{MAX_VLAN_ID}")
+    return vlan_id
@@ -0,0 +1,233 @@
+import argparse
+import logging
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+from cli_args import add_input_arguments, add_site_workers_argument
+from inventory import (UNKNOWN_SITE, classify_hostname, classify_hostnames, device_sort_key, discover_sites, is_firewall,
+                       switch_site)
+from logging_setup import add_logging_arguments, configure_logging
+from ndjson_io import COMPRESSIONS
+from profiling import add_profile_arguments, profiling
+from report_output import add_formats_argument, frame_tasks, write_reports
+from snapshot import Snapshot
+from snapshot_cache import CACHE_FILENAME, SnapshotCache
+from stage_timer import RunReport
+from vlan_set import VlanSet
+
+# The report modules import pandas / numpy when loaded, so they are imported by the commands that
+# run them, and a lookup never loads them
+
+CONFIGS_DIR = Path(r"C:\vlan_script_functions\configs")
+OUTPUT_DIR = Path(r"C:\vlan_script_functions\vlandiff_outputs")
+
+log = logging.getLogger(__name__)
+
+# Reports written by summary unless --formats says otherwise
+SUMMARY_FORMATS = ["csv"]
+
+
+def sorted_hostnames(hostnames) -> List[str]:
+    """Hostnames by site, role, env and number"""
+    return [info.hostname for info in sorted(classify_hostnames(hostnames).values(), key=device_sort_key)]
+
+
+def site_switch_vlans(snapshot: Snapshot) -> Dict[str, VlanSet]:
+    """hostname -> VLANs for every switch at a known site"""
+    return {hostname: VlanSet(vlan_id for vlan_id, _ in vlans)
+            for hostname, vlans in snapshot.vlan_records if switch_site(hostname) != UNKNOWN_SITE}
+
+
+def run_cor_tor(snapshot: Snapshot, out_dir: Path, args):
+    import cor_tor_zone_comparison as cor_tor
+
+    report = RunReport("cor_tor_zone_comparison")
+    vlan_data = cor_tor.site_vlan_data(snapshot.vlan_records)
+    cor_tor.compare_and_write(vlan_data, snapshot.vrf_records, out_dir, report, args.full,
+                              args.formats or cor_tor.DEFAULT_FORMATS, args.compress, args.site_workers)
+    report.write(out_dir)
+
+
+def run_svi_fw(snapshot: Snapshot, out_dir: Path, args):
+    import svi_fw_vlan_comparison as svi_fw
+
+    report = RunReport("svi_fw_vlan_comparison")
+    results = svi_fw.vlan_results(snapshot.vlan_records)
+    results, vlan_zones = svi_fw.add_core_svis(results, snapshot.vrf_records)
+    results = svi_fw.add_firewall_interfaces(results, snapshot.firewall_records)
+    svi_fw.write_report(results, vlan_zones, out_dir, report, args.formats or svi_fw.DEFAULT_FORMATS)
+    report.write(out_dir)
+
+
+def run_summary(snapshot: Snapshot, out_dir: Path, args):
+    """
+    Per site: switches by role, VLAN count and the VLANs no other site has.
+    Writes vlan_summary with one row per switch and its VLANs, as get_vlans.py did for DC1/DC2.
+    """
+    host_vlans = site_switch_vlans(snapshot)
+    sites = discover_sites(host_vlans)
+    site_vlans = {site: VlanSet() for site in sites}
+    site_roles = {site: Counter() for site in sites}
+    for hostname, vlans in host_vlans.items():
+        info = classify_hostname(hostname)
+        site_vlans[info.site] = site_vlans[info.site] | vlans
+        site_roles[info.site][info.role] += 1
+
+    for site in sites:
+        others = VlanSet()
+        for other in sites:
+            if other != site:
+                others = others | site_vlans[other]
+        only_here = site_vlans[site] - others
+        roles = ", ".join(f"{role} {count}" for role, count in sorted(site_roles[site].items()))
+        log.info("%s: %d switches (%s), %d VLANs, %d only at %s%s", site, sum(site_roles[site].values()), roles,
+                 len(site_vlans[site]), len(only_here), site, f": {only_here.format_ranges()}" if only_here else "")
+
+    import pandas
+
+    rows = []
+    for hostname in sorted_hostnames(host_vlans):
+        info = classify_hostname(hostname)
+        rows.append({"Hostname": hostname, "Site": info.site, "Role": info.role, "Env": info.env,
+                     "VLAN_Count": len(host_vlans[hostname]),
+                     "VLAN_IDs": ", ".join(host_vlans[hostname].to_strings())})
+    df = pandas.DataFrame(rows, columns=["Hostname", "Site", "Role", "Env", "VLAN_Count", "VLAN_IDs"])
+    write_reports(frame_tasks(df, out_dir / "vlan_summary", args.formats or SUMMARY_FORMATS, index=False,
+                              sheet_name="VLAN Summary"))
+
+
+# lookup prints its answer to stdout rather than logging it, so -q still shows it
+
+def lookup_vlan(snapshot: Snapshot, vlan_id: str):
+    """Every device with the VLAN, its SVIs and firewall interfaces, and the switches at those sites without it"""
+    holders = {hostname: name for hostname, vlans in snapshot.vlan_records if switch_site(hostname) != UNKNOWN_SITE
+               for record_id, name in vlans if record_id == vlan_id}
+    svis = {hostname: (interface, vrf_name, ip) for hostname, records in snapshot.vrf_records
+            for interface, vrf_name, ip in records if interface == f"Vlan{vlan_id}"}
+    fw_interfaces = {hostname: (name, zone, fwd, ip) for hostname, records in snapshot.firewall_records
+                     if is_firewall(hostname) for tag, name, zone, fwd, ip in records if tag == vlan_id}
+
+    if not holders and not svis and not fw_interfaces:
+        print(f"VLAN {vlan_id}: not found on any device")
+        return
+
+    print(f"VLAN {vlan_id}:")
+    for hostname in sorted_hostnames(set(holders) | set(svis)):
+        info = classify_hostname(hostname)
+        details = [holders[hostname]] if hostname in holders else ["(no VLAN, SVI only)"]
+        if hostname in svis:
+            details.append("SVI %s vrf %s %s" % svis[hostname])
+        print("  %-32s %-4s %-4s %s" % (hostname, info.site, info.role, "  ".join(details)))
+    for hostname in sorted_hostnames(fw_interfaces):
+        info = classify_hostname(hostname)
+        print("  %-32s %-4s %-4s %s zone %s fwd %s %s" % (hostname, info.site, info.role, *fw_interfaces[hostname]))
+
+    sites = {switch_site(hostname) for hostname in holders}
+    for site in sorted(sites):
+        missing = sorted_hostnames(hostname for hostname, _ in snapshot.vlan_records
+                                   if switch_site(hostname) == site and hostname not in holders)
+        if missing:
+            print(f"  Missing at {site}: {', '.join(missing)}")
+
+
+def lookup_device(snapshot: Snapshot, term: str):
+    """Devices whose hostname contains term (any case): their VLANs, SVI VRFs and firewall zones"""
+    needle = term.lower()
+    vlans = {hostname: records for hostname, records in snapshot.vlan_records if needle in hostname.lower()}
+    svis = {hostname: records for hostname, records in snapshot.vrf_records if needle in hostname.lower()}
+    fw_interfaces = {hostname: records for hostname, records in snapshot.firewall_records
+                     if needle in hostname.lower()}
+
+    hostnames = sorted_hostnames(set(vlans) | set(svis) | set(fw_interfaces))
+    if not hostnames:
+        print(f"{term}: no matching device")
+        return
+
+    for hostname in hostnames:
+        info = classify_hostname(hostname)
+        print(f"{hostname}: site {info.site}, role {info.role or '?'}, env {info.env or '?'}")
+        if hostname in vlans:
+            vlan_set = VlanSet(vlan_id for vlan_id, _ in vlans[hostname])
+            print(f"  {len(vlan_set)} VLANs: {vlan_set.format_ranges()}")
+        if svis.get(hostname):
+            vrf_names = Counter(vrf_name for _, vrf_name, _ in svis[hostname])
+            print(f"  {len(svis[hostname])} SVIs: "
+                  + ", ".join(f"{vrf_name} ({count})" for vrf_name, count in sorted(vrf_names.items())))
+        if fw_interfaces.get(hostname):
+            zones = Counter(zone for _, _, zone, _, _ in fw_interfaces[hostname])
+            print(f"  {len(fw_interfaces[hostname])} tagged interfaces: "
+                  + ", ".join(f"{zone} ({count})" for zone, count in sorted(zones.items())))
+
+
+def run_lookup(snapshot: Snapshot, terms: List[str]):
+    for term in terms:
+        if term.isdigit():
+            lookup_vlan(snapshot, str(int(term)))
+        else:
+            lookup_device(snapshot, term)
+
+
+# Report subdirectory of --out-dir and runner for each report command; all runs every one of them
+REPORTS = {
+    "cor-tor": ("cor_tor", run_cor_tor),
+    "svi-fw": ("svi_fw", run_svi_fw),
+    "summary": ("", run_summary),
+}
+
+
+def main(args):
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cache = SnapshotCache(out_dir / CACHE_FILENAME, args.verify_hash) if not args.no_cache else None
+
+    if args.command == "lookup":
+        run_lookup(Snapshot(args.configs_dir, args.workers, cache), args.terms)
+    else:
+        report = RunReport("vlandiff")
+        snapshot = Snapshot(args.configs_dir, args.workers, cache, report)
+        for command in REPORTS if args.command == "all" else [args.command]:
+            log.info("\n=== %s ===", command)
+            subdir, run = REPORTS[command]
+            run(snapshot, out_dir / subdir, args)
+        report.write(out_dir)
+
+    if cache is not None:
+        log.info(cache.stats())
+        cache.close()
+
+
+def parse_args(argv=None):
+    # Options shared by every command, accepted after the command name
+    common = argparse.ArgumentParser(add_help=False)
+    add_input_arguments(common, CONFIGS_DIR)
+    common.add_argument("--out-dir", type=Path, default=OUTPUT_DIR,
+                        help="reports go to cor_tor/ and svi_fw/ under it, the parsed-file cache to the folder itself")
+    add_logging_arguments(common)
+    add_profile_arguments(common)
+
+    report_options = argparse.ArgumentParser(add_help=False)
+    add_formats_argument(report_options, None)
+    report_options.add_argument("--full", action="store_true",
+                                help="cor-tor: recompute every comparison instead of only those whose inputs changed")
+    report_options.add_argument("--compress", choices=COMPRESSIONS, default="none",
+                                help="cor-tor: compress the NDJSON outputs (.ndjson.gz / .ndjson.zst)")
+    add_site_workers_argument(report_options)
+
+    parser = argparse.ArgumentParser(description="VLAN reports from one parse of the configs tree")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("cor-tor", parents=[common, report_options], help="zone VLANs of COR vs TOR switches")
+    commands.add_parser("svi-fw", parents=[common, report_options], help="VLAN, SVI and firewall comparison")
+    commands.add_parser("summary", parents=[common, report_options], help="VLANs per site and per switch")
+    commands.add_parser("all", parents=[common, report_options], help="cor-tor, svi-fw and summary in one run")
+    lookup = commands.add_parser("lookup", parents=[common], help="where a VLAN is, or what a device has")
+    lookup.add_argument("terms", nargs="+", metavar="VLAN_OR_HOSTNAME",
+                        help="VLAN IDs, and hostnames or parts of them (any case)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    configure_logging(args.verbose, args.quiet)
+    with profiling(args.out_dir, "vlandiff", args.profile, args.profile_top):
+        main(args)
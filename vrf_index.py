@@ -0,0 +1,59 @@
+from typing import Dict, Iterable, List, Tuple
+
+from zone_classifier import ZoneClassifier
+
+# host -> list of {"VRF_NAME", "INTERFACE", "VLAN_ID"} rows, same shape the comparison functions use
+ZoneVrfData = Dict[str, List[Dict[str, str]]]
+
+
+class VrfIndex:
+    """
+    Every SVI row from show_ip_interface_brief_vrf_all.json, loaded once and indexed by zone.
+    A zone matches a VRF when the zone string appears in the VRF name (case-insensitive),
+    and the match is worked out once per distinct VRF name (see ZoneClassifier).
+    """
+
+    def __init__(self, zones: Iterable[str]):
+        self.zones = list(zones)
+        self.rows: List[Tuple[str, str, str, str]] = []  # (host, vrf, interface, vlan_id)
+        self._by_zone: Dict[str, ZoneVrfData] = {zone: {} for zone in self.zones}
+        self.classifier = ZoneClassifier.from_zones(self.zones)
+
+    def zones_for_vrf(self, vrf_name: str) -> Tuple[str, ...]:
+        return self.classifier.classify(vrf_name)
+
+    def add_host(self, hostname: str, svi_records: List[Tuple[str, str, str]]):
+        """
+        Adds the SVI rows of one device, as (interface, vrf, ip) records from ingest.parse_vrf_file
+        """
+        for interface, vrf_name, _ in svi_records:
+            vlan_id = interface.replace("Vlan", "") if interface.startswith("Vlan") else ""
+            if not vlan_id:
+                continue
+            self.rows.append((hostname, vrf_name, interface, vlan_id))
+
+            for zone in self.zones_for_vrf(vrf_name):
+                self._by_zone[zone].setdefault(hostname, []).append({
+                    "VRF_NAME": vrf_name,
+                    "INTERFACE": interface,
+                    "VLAN_ID": vlan_id
+                })
+
+    def zone_view(self, zone: str) -> ZoneVrfData:
+        """
+        Returns host -> SVI rows for one zone. For a zone not given at construction the view is
+        built from the stored rows on each call, leaving the index and its classifier as they are.
+        """
+        if zone in self._by_zone:
+            return self._by_zone[zone]
+
+        classifier = ZoneClassifier.from_zones([zone])
+        view: ZoneVrfData = {}
+        for hostname, vrf_name, interface, vlan_id in self.rows:
+            if classifier.classify(vrf_name):
+                view.setdefault(hostname, []).append({
+                    "VRF_NAME": vrf_name,
+                    "INTERFACE": interface,
+                    "VLAN_ID": vlan_id
+                })
+        return view
@@ -0,0 +1,64 @@
+from typing import Dict, Iterable, Tuple
+
+# Trie key that holds the zones whose pattern ends at a node; never a single character
+_END = ""
+
+
+class ZoneClassifier:
+    """
+    Maps VRF names to zones. Each zone has one or more patterns and matches a VRF when any of
+    them appears in the VRF name (case-insensitive). All patterns are compiled into one trie,
+    so a name is scanned once however many patterns there are, and the answer is memoised
+    per distinct VRF name. Every matching zone is returned, in zone order, so a VRF that
+    falls in more than one zone can be reported rather than silently given to the first.
+    """
+
+    def __init__(self, zone_patterns: Dict[str, Iterable[str]]):
+        self.zones = list(zone_patterns)
+        self._rank = {zone: i for i, zone in enumerate(self.zones)}
+        self._trie: Dict[str, dict] = {}
+        self._cache: Dict[str, Tuple[str, ...]] = {}
+
+        for zone, patterns in zone_patterns.items():
+            for pattern in patterns:
+                if not pattern:
+                    continue
+                node = self._trie
+                for char in pattern.lower():
+                    node = node.setdefault(char, {})
+                node.setdefault(_END, set()).add(zone)
+
+    @classmethod
+    def from_zones(cls, zones: Iterable[str]) -> "ZoneClassifier":
+        """Each zone name is its own pattern, e.g. "EA-" matches "EA-BMS-PRD" """
+        return cls({zone: [zone] for zone in zones})
+
+    def classify(self, vrf_name: str) -> Tuple[str, ...]:
+        """All zones the VRF belongs to, in zone order"""
+        zones = self._cache.get(vrf_name)
+        if zones is None:
+            zones = self._match(vrf_name) if vrf_name else ()
+            self._cache[vrf_name] = zones
+        return zones
+
+    def first(self, vrf_name: str) -> str:
+        """The first matching zone in zone order, or "" """
+        zones = self.classify(vrf_name)
+        return zones[0] if zones else ""
+
+    def overlaps(self) -> Dict[str, Tuple[str, ...]]:
+        """VRF names seen so far that matched more than one zone"""
+        return {vrf_name: zones for vrf_name, zones in self._cache.items() if len(zones) > 1}
+
+    def _match(self, vrf_name: str) -> Tuple[str, ...]:
+        name = vrf_name.lower()
+        found = set()
+        for start in range(len(name)):
+            node = self._trie
+            for i in range(start, len(name)):
+                node = node.get(name[i])
+                if node is None:
+                    break
+                if _END in node:
+                    found.update(node[_END])
+        return tuple(sorted(found, key=self._rank.__getitem__))